@@ -0,0 +1,167 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .models.product import Product
+
+try:
+    import numpy as np
+except ImportError:  # Analytics are optional
+    np = None
+
+COLUMNS = ('price', 'per_unit_price', 'package_size', 'stock')
+
+
+class ProductTable:
+    """
+    Columnar NumPy view of products for vectorized analytics.
+
+    Float columns use NaN for missing values; package_size uses 0 for
+    unknown. Stores are categorical: store_codes index into stores.
+    """
+
+    def __init__(self,
+                 price: 'np.ndarray',
+                 per_unit_price: 'np.ndarray',
+                 package_size: 'np.ndarray',
+                 stock: 'np.ndarray',
+                 available: 'np.ndarray',
+                 store_codes: 'np.ndarray',
+                 stores: List[str],
+                 observed_at: Optional['np.ndarray'] = None):
+        if np is None:
+            raise ImportError("numpy is required for ProductTable")
+        self.price = price
+        self.per_unit_price = per_unit_price
+        self.package_size = package_size
+        self.stock = stock
+        self.available = available
+        self.store_codes = store_codes
+        self.stores = stores
+        self.observed_at = observed_at
+        self._store_index = {store: code for code, store in enumerate(stores)}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence]) -> 'ProductTable':
+        """
+        Build a table from (store, price, per_unit_price, package_size, stock, available[, observed_at]) rows.
+        """
+        if np is None:
+            raise ImportError("numpy is required for ProductTable")
+        rows = list(rows)
+        stores: List[str] = []
+        store_index: Dict[str, int] = {}
+        codes = np.empty(len(rows), dtype=np.int32)
+        for i, row in enumerate(rows):
+            code = store_index.get(row[0])
+            if code is None:
+                code = store_index[row[0]] = len(stores)
+                stores.append(row[0])
+            codes[i] = code
+
+        def floats(position: int) -> 'np.ndarray':
+            return np.array([np.nan if r[position] is None else r[position] for r in rows], dtype=np.float64)
+
+        has_time = bool(rows) and len(rows[0]) > 6
+        return cls(
+            price=floats(1),
+            per_unit_price=floats(2),
+            package_size=np.array([r[3] or 0 for r in rows], dtype=np.int32),
+            stock=floats(4),
+            available=np.array([bool(r[5]) for r in rows], dtype=bool),
+            store_codes=codes,
+            stores=stores,
+            observed_at=floats(6) if has_time else None
+        )
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> 'ProductTable':
+        """Build a table from Product objects."""
+        return cls.from_rows(
+            (p.store, p.price, p.per_unit_price, p.package_size, p.stock, p.available)
+            for p in products
+        )
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def column(self, name: str, mask: Optional['np.ndarray'] = None) -> 'np.ndarray':
+        """Values of one column, optionally masked."""
+        if name not in COLUMNS:
+            raise ValueError(f"Unknown column: {name}")
+        values = getattr(self, name)
+        return values if mask is None else values[mask]
+
+    def mask(self,
+             store: Optional[str] = None,
+             package_size: Optional[int] = None,
+             only_available: bool = False,
+             min_price: Optional[float] = None,
+             max_price: Optional[float] = None,
+             since: Optional[float] = None) -> 'np.ndarray':
+        """Boolean row mask combining the given filters."""
+        mask = np.ones(len(self), dtype=bool)
+        if store is not None:
+            code = self._store_index.get(store.lower(), self._store_index.get(store))
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.store_codes == code
+        if package_size is not None:
+            mask &= self.package_size == package_size
+        if only_available:
+            mask &= self.available
+        if min_price is not None:
+            mask &= self.price >= min_price
+        if max_price is not None:
+            mask &= self.price <= max_price
+        if since is not None and self.observed_at is not None:
+            mask &= self.observed_at >= since
+        return mask
+
+    @staticmethod
+    def _stats(values: 'np.ndarray', percentiles: Sequence[float]) -> Dict[str, Optional[float]]:
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            stats = {'count': 0, 'min': None, 'max': None, 'mean': None}
+            stats.update({f'p{q:g}': None for q in percentiles})
+            return stats
+        stats = {
+            'count': int(values.size),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'mean': float(values.mean()),
+        }
+        for q, value in zip(percentiles, np.percentile(values, percentiles)):
+            stats[f'p{q:g}'] = float(value)
+        return stats
+
+    def describe(self,
+                 column: str = 'price',
+                 mask: Optional['np.ndarray'] = None,
+                 percentiles: Sequence[float] = (50, 90)) -> Dict[str, Optional[float]]:
+        """Count, min, max, mean and percentiles of a column. p50 is the median."""
+        return self._stats(self.column(column, mask).astype(np.float64), percentiles)
+
+    def group_by_store(self,
+                       column: str = 'per_unit_price',
+                       mask: Optional['np.ndarray'] = None,
+                       percentiles: Sequence[float] = (50, 90)) -> Dict[str, Dict[str, Optional[float]]]:
+        """describe() per store, e.g. min/median/p90 unit price for every store."""
+        values = self.column(column).astype(np.float64)
+        codes = self.store_codes
+        if mask is not None:
+            values, codes = values[mask], codes[mask]
+
+        order = np.argsort(codes, kind='stable')
+        codes, values = codes[order], values[order]
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+        return {
+            self.stores[int(group_codes[0])]: self._stats(group_values, percentiles)
+            for group_codes, group_values in zip(np.split(codes, boundaries), np.split(values, boundaries))
+            if group_codes.size
+        }
+
+    def histogram(self,
+                  column: str = 'price',
+                  bins: int = 10,
+                  mask: Optional['np.ndarray'] = None) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Counts and bin edges of a column's distribution, ignoring missing values."""
+        values = self.column(column, mask).astype(np.float64)
+        return np.histogram(values[~np.isnan(values)], bins=bins)
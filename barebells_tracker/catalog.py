@@ -0,0 +1,248 @@
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from .models.product import Product
+from .utils.filtering import ExclusionMatcher
+from .utils.sorting import TopKUnique
+
+SINGLES_MAX_PRICE = 100  # Anything pricier labelled as a single bar is a mislabelled multipack
+
+
+# Sort orders of the pre-sorted views, by sort_by name
+SORT_KEYS: Dict[str, Callable[[Product], Optional[float]]] = {
+    'price': lambda p: p.price,
+    'unit_price': lambda p: p.per_unit_price,
+    'package_size': lambda p: p.package_size,
+}
+
+ALL = ('all',)  # Scope of the views over every product
+
+Scope = Tuple  # ALL, ('store', name) or ('size', package size)
+
+
+def _sorted_view(indices: List[int], key, products: List[Product], reverse: bool) -> List[int]:
+    """Indices sorted on key, with products whose key is None last, like utils.sorting."""
+    with_key = [i for i in indices if key(products[i]) is not None]
+    without_key = [i for i in indices if key(products[i]) is None]
+    return sorted(with_key, key=lambda i: key(products[i]), reverse=reverse) + without_key
+
+
+class ProductCatalog:
+    """
+    Indexed, read-only view of one sweep's products.
+
+    Built once per sweep: index lists by store and package size, per-product
+    store, availability and exclusion flags, and views of each index list
+    sorted by price, unit price or package size (built on first use).
+    Queries walk the narrowest sorted view and test the flags of each
+    product they pass, so top-k queries stop after about k hits instead
+    of touching every product.
+    """
+
+    def __init__(self, products: List[Product]):
+        self.products = list(products)
+        self.size = len(self.products)
+        self._stores = [p.store.lower() for p in self.products]
+        self._available = bytes(bool(p.available) for p in self.products)
+
+        self._scopes: Dict[Scope, List[int]] = {ALL: list(range(self.size))}
+        for i, p in enumerate(self.products):
+            self._scopes.setdefault(('store', self._stores[i]), []).append(i)
+            self._scopes.setdefault(('size', p.package_size), []).append(i)
+
+        self._views: Dict[Tuple[Scope, str, bool], List[int]] = {}
+        self._excluded: Dict[FrozenSet[str], bytes] = {}
+        self._query_cache: Dict[tuple, object] = {}
+
+    def excluded_flags(self, exclusions: ExclusionMatcher) -> bytes:
+        """
+        flags[i] is 1 if the matcher excludes product i; computed once per pattern set.
+
+        The matcher caches verdicts by name across sweeps, so names are only
+        lowercased and matched the first time they are seen.
+        """
+        flags = self._excluded.get(exclusions.patterns)
+        if flags is None:
+            flags = self._excluded[exclusions.patterns] = bytes(
+                exclusions.is_excluded(p.name) for p in self.products)
+        return flags
+
+    def _view(self, scope: Scope, sort_by: Optional[str], reverse: bool) -> List[int]:
+        """Indices in a scope, in sorted view order or sweep order."""
+        indices = self._scopes.get(scope, [])
+        if sort_by not in SORT_KEYS:
+            return indices
+        key = (scope, sort_by, reverse)
+        view = self._views.get(key)
+        if view is None:
+            # Sorting is stable, so a scope's view is the full view filtered to the scope
+            view = self._views[key] = _sorted_view(indices, SORT_KEYS[sort_by], self.products, reverse)
+        return view
+
+    def _iter(self,
+              store: Optional[str] = None,
+              package_size: Any = ALL,
+              only_available: bool = False,
+              exclusions: Optional[ExclusionMatcher] = None,
+              sort_by: Optional[str] = None,
+              reverse: bool = False) -> Iterator[Product]:
+        """
+        Matching products, in sorted view order or sweep order.
+
+        Walks the store's or package size's view, whichever applies, so
+        the work is proportional to the products passed, not the catalog.
+        """
+        store = store.lower() if store else None
+        if store is not None:
+            scope = ('store', store)
+        elif package_size is not ALL:
+            scope = ('size', package_size)
+        else:
+            scope = ALL
+        check_size = store is not None and package_size is not ALL
+        available = self._available if only_available else None
+        excluded = self.excluded_flags(exclusions) if exclusions else None
+
+        products = self.products
+        for i in self._view(scope, sort_by, reverse):
+            if check_size and products[i].package_size != package_size:
+                continue
+            if available is not None and not available[i]:
+                continue
+            if excluded is not None and excluded[i]:
+                continue
+            yield products[i]
+
+    def _iter_base(self,
+                   package_size: Optional[int],
+                   exclusions: Optional[ExclusionMatcher],
+                   sort_by: Optional[str] = None) -> Iterator[Product]:
+        """Available, non-excluded products of a package size (singles for None), as best deals see them."""
+        return self._iter(
+            package_size=1 if package_size is None else package_size,
+            only_available=True,
+            exclusions=exclusions,
+            sort_by=sort_by
+        )
+
+    def get_products(self,
+                     store: Optional[str] = None,
+                     package_size: Optional[int] = None,
+                     min_price: Optional[float] = None,
+                     max_price: Optional[float] = None,
+                     only_available: bool = True,
+                     min_stock: Optional[int] = None,
+                     sort_by: Optional[str] = None,
+                     reverse_sort: bool = False,
+                     exclusions: Optional[ExclusionMatcher] = None) -> List[Product]:
+        """Filtered and sorted products, same semantics as BarebellsTracker.get_products."""
+        products = self._iter(
+            store=store,
+            package_size=ALL if package_size is None else package_size,
+            only_available=only_available,
+            exclusions=exclusions,
+            sort_by=sort_by,
+            reverse=reverse_sort
+        )
+        results = []
+        for p in products:
+            if min_price is not None and p.price < min_price:
+                continue
+            if max_price is not None and p.price > max_price:
+                if sort_by == 'price' and not reverse_sort:
+                    break  # Ascending price view, nothing cheaper follows
+                continue
+            if min_stock is not None and (p.stock is None or p.stock < min_stock):
+                continue
+            results.append(p)
+        return results
+
+    def get_best_deals(self,
+                       package_size: Optional[int] = None,
+                       limit: int = 5,
+                       exclusions: Optional[ExclusionMatcher] = None) -> List[Product]:
+        """
+        Cheapest available products of a package size, one per (store, price).
+
+        Walks the pre-sorted view and stops after `limit` distinct deals.
+        """
+        key = ('best_deals', package_size, limit, exclusions.patterns if exclusions else frozenset())
+        if key in self._query_cache:
+            return list(self._query_cache[key])
+
+        sort_by = 'unit_price' if package_size and package_size > 1 else 'price'
+
+        seen = set()
+        deals = []
+        for p in self._iter_base(package_size, exclusions, sort_by):
+            if len(deals) >= limit:
+                break
+            if package_size is None and p.price > SINGLES_MAX_PRICE:
+                break  # Ascending price view, only pricier products follow
+            price_key = (p.store, p.price if package_size is None else p.per_unit_price)
+            if price_key not in seen:
+                seen.add(price_key)
+                deals.append(p)
+
+        self._query_cache[key] = deals
+        return list(deals)
+
+    def get_best_deals_for_sizes(self,
+                                 package_sizes: Iterable[Optional[int]],
+                                 limit: int = 5,
+                                 exclusions: Optional[ExclusionMatcher] = None) -> Dict[Optional[int], List[Product]]:
+        """
+        get_best_deals for several package sizes from a single scan.
+
+        Each product is routed to the sizes it qualifies for and fed to a
+        bounded top-k selector per size, so the scan is O(n log k).
+        """
+        selectors: Dict[Optional[int], TopKUnique] = {}
+        for size in package_sizes:
+            if size and size > 1:
+                sort_key = lambda p: p.per_unit_price
+            else:
+                sort_key = lambda p: p.price
+            if size is None:
+                unique_key = lambda p: (p.store, p.price)
+            else:
+                unique_key = lambda p: (p.store, p.per_unit_price)
+            selectors[size] = TopKUnique(limit, sort_key, unique_key)
+
+        singles = selectors.get(None)
+        for p in self._iter(only_available=True, exclusions=exclusions):
+            selector = selectors.get(p.package_size)
+            if selector is not None:
+                selector.add(p)
+            if singles is not None and p.package_size == 1 and p.price <= SINGLES_MAX_PRICE:
+                singles.add(p)
+
+        return {size: selector.result() for size, selector in selectors.items()}
+
+    def get_price_range(self,
+                        package_size: Optional[int] = None,
+                        exclusions: Optional[ExclusionMatcher] = None) -> Dict[str, Optional[float]]:
+        """Min/max/avg price (unit price for multipacks), cached per query for this sweep."""
+        key = ('price_range', package_size, exclusions.patterns if exclusions else frozenset())
+        if key in self._query_cache:
+            return dict(self._query_cache[key])
+
+        products = self._iter_base(package_size, exclusions)
+        if package_size and package_size > 1:
+            prices = [p.per_unit_price for p in products if p.per_unit_price is not None]
+        else:
+            prices = [p.price for p in products
+                      if package_size is not None or p.price <= SINGLES_MAX_PRICE]
+
+        stats = {
+            'min_price': min(prices) if prices else None,
+            'max_price': max(prices) if prices else None,
+            'avg_price': sum(prices) / len(prices) if prices else None
+        }
+        self._query_cache[key] = stats
+        return dict(stats)
+
+    def get_store_summary(self) -> Dict[str, int]:
+        """Product counts by store, in order of first appearance."""
+        summary = {}
+        for p in self.products:
+            summary[p.store] = summary.get(p.store, 0) + 1
+        return summary
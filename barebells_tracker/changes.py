@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from .models.product import Product
+
+NEW = 'new'
+PRICE_DROP = 'price_drop'
+PRICE_RISE = 'price_rise'
+STOCK_CHANGE = 'stock_change'
+AVAILABILITY = 'availability'
+DELISTED = 'delisted'
+
+PRICE_EPSILON = 0.005  # Prices closer than this are the same price
+
+ProductKey = Tuple[str, str]
+
+
+@dataclass
+class Change:
+    """One change to one product between two sweeps."""
+    kind: str
+    product: Product                    # Current product, or last seen one if delisted
+    previous: Optional[Product] = None
+
+    def __str__(self) -> str:
+        if self.kind in (PRICE_DROP, PRICE_RISE):
+            return f"{self.kind}: {self.product.name} ({self.product.store}) {self.previous.price:.2f} -> {self.product.price:.2f} SEK"
+        if self.kind == STOCK_CHANGE:
+            return f"{self.kind}: {self.product.name} ({self.product.store}) stock {self.previous.stock} -> {self.product.stock}"
+        if self.kind == AVAILABILITY:
+            state = 'available' if self.product.available else 'unavailable'
+            return f"{self.kind}: {self.product.name} ({self.product.store}) now {state}"
+        return f"{self.kind}: {self.product.name} ({self.product.store})"
+
+
+def product_key(product: Product) -> ProductKey:
+    """Identity of a product across sweeps."""
+    return (product.store, product.url)
+
+
+def snapshot(products: List[Product]) -> Dict[ProductKey, Product]:
+    """Index products by identity."""
+    return {product_key(p): p for p in products}
+
+
+def diff_snapshots(previous: Dict[ProductKey, Product],
+                   current: Dict[ProductKey, Product],
+                   swept_stores: Optional[Set[str]] = None) -> List[Change]:
+    """
+    Compute the changes from one snapshot to the next.
+
+    Args:
+        previous: Snapshot of the last sweep
+        current: Snapshot of this sweep
+        swept_stores: Stores this sweep actually covered. Products of other
+            stores are not reported as delisted. Defaults to the stores in current.
+
+    Returns:
+        List of changes; a product can have several (e.g. price drop and back in stock)
+    """
+    if swept_stores is None:
+        swept_stores = {store for store, _ in current}
+
+    changes = []
+    for key, product in current.items():
+        old = previous.get(key)
+        if old is None:
+            changes.append(Change(NEW, product))
+            continue
+
+        if abs(product.price - old.price) > PRICE_EPSILON:
+            changes.append(Change(PRICE_DROP if product.price < old.price else PRICE_RISE, product, old))
+        if product.available != old.available:
+            changes.append(Change(AVAILABILITY, product, old))
+        if product.stock != old.stock:
+            changes.append(Change(STOCK_CHANGE, product, old))
+
+    for key, old in previous.items():
+        if key[0] in swept_stores and key not in current:
+            changes.append(Change(DELISTED, old, old))
+
+    return changes
+
+
+def merge_snapshots(previous: Dict[ProductKey, Product],
+                    current: Dict[ProductKey, Product],
+                    swept_stores: Set[str]) -> Dict[ProductKey, Product]:
+    """Carry over products of stores this sweep did not cover."""
+    merged = {key: p for key, p in previous.items() if key[0] not in swept_stores}
+    merged.update(current)
+    return merged
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+from .models.product import Product
+from .scrapers.base import BaseScraper
+from .scrapers.client import close_async_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+@dataclass
+class SweepResult:
+    """Outcome of one sweep over a set of scrapers."""
+    products: List[Product] = field(default_factory=list)
+    completed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+def run_on_daemon_threads(fn: Callable[[T], R], items: Iterable[T],
+                          max_workers: int, name: str) -> List['Future[R]']:
+    """
+    Call fn on every item on up to max_workers daemon threads, one future per item.
+
+    ThreadPoolExecutor workers are joined at interpreter exit, so a store
+    still running past a sweep deadline would keep the process alive;
+    these workers don't. Cancel the futures of items not started yet to
+    drop them.
+    """
+    pending: 'queue.SimpleQueue' = queue.SimpleQueue()
+    futures = []
+    for item in items:
+        future: 'Future[R]' = Future()
+        futures.append(future)
+        pending.put((item, future))
+
+    def work() -> None:
+        while True:
+            try:
+                item, future = pending.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(item))
+            except Exception as e:
+                future.set_exception(e)
+
+    for i in range(max(1, min(max_workers, len(futures)))):
+        threading.Thread(target=work, name=f'{name}_{i}', daemon=True).start()
+    return futures
+
+
+def _collect(scrapers: List[BaseScraper], futures: List, not_done: set,
+             deadline: Optional[float], start: float) -> SweepResult:
+    """Gather finished futures into a SweepResult, in scraper order."""
+    result = SweepResult()
+    for scraper, future in zip(scrapers, futures):
+        name = scraper.__class__.__name__
+        if future in not_done:
+            logger.error("Scraper %s did not finish within %ss deadline", name, deadline)
+            result.timed_out.append(scraper.store_name)
+            continue
+        try:
+            result.products.extend(future.result())
+            result.completed.append(scraper.store_name)
+        except Exception as e:
+            logger.error("Error with scraper %s: %s", name, e)
+            result.failed[scraper.store_name] = str(e)
+
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+def run_concurrent(scrapers: List[BaseScraper],
+                   max_workers: int = 8,
+                   per_store_limit: int = 1,
+                   deadline: Optional[float] = None) -> SweepResult:
+    """
+    Run scrapers on a bounded thread pool.
+
+    Args:
+        scrapers: Scrapers to run
+        max_workers: Global limit on scrapers running at the same time
+        per_store_limit: Limit on scrapers for the same store running at the same time
+        deadline: Seconds to wait for the whole sweep; stores still running
+            after that are reported as timed out and their results dropped
+
+    Returns:
+        SweepResult with products from every store that finished in time
+    """
+    if not scrapers:
+        return SweepResult()
+
+    start = time.monotonic()
+    deadline_at = start + deadline if deadline is not None else None
+    store_limits: Dict[str, threading.Semaphore] = {}
+    for scraper in scrapers:
+        store_limits.setdefault(scraper.store_name, threading.Semaphore(per_store_limit))
+
+    def scrape(scraper: BaseScraper) -> List[Product]:
+        with store_limits[scraper.store_name]:
+            # Stragglers stop retrying and paging, and time out their requests, at the deadline
+            scraper.deadline_at = deadline_at
+            try:
+                return scraper.scrape_products()
+            finally:
+                scraper.deadline_at = None
+
+    futures = run_on_daemon_threads(scrape, scrapers, max_workers, 'scraper')
+    _, not_done = wait(futures, timeout=deadline)
+    for future in not_done:
+        future.cancel()  # Stores not started yet
+
+    return _collect(scrapers, futures, not_done, deadline, start)
+
+
+async def run_async(scrapers: List[BaseScraper],
+                    max_workers: int = 8,
+                    per_store_limit: int = 1,
+                    deadline: Optional[float] = None) -> SweepResult:
+    """
+    Run scrapers on the running event loop through the shared async client.
+
+    Same limits and deadline semantics as run_concurrent. The shared client
+    stays open so connections are reused by the next sweep on this loop.
+    """
+    if not scrapers:
+        return SweepResult()
+
+    start = time.monotonic()
+    deadline_at = start + deadline if deadline is not None else None
+    global_limit = asyncio.Semaphore(max_workers)
+    store_limits: Dict[str, asyncio.Semaphore] = {}
+    for scraper in scrapers:
+        store_limits.setdefault(scraper.store_name, asyncio.Semaphore(per_store_limit))
+
+    async def scrape(scraper: BaseScraper) -> List[Product]:
+        async with global_limit, store_limits[scraper.store_name]:
+            scraper.deadline_at = deadline_at
+            try:
+                return await scraper.async_scrape_products()
+            finally:
+                scraper.deadline_at = None
+
+    tasks = [asyncio.ensure_future(scrape(scraper)) for scraper in scrapers]
+    _, not_done = await asyncio.wait(tasks, timeout=deadline)
+    for task in not_done:
+        task.cancel()
+
+    return _collect(scrapers, tasks, not_done, deadline, start)
+
+
+_sweep_loop: Optional[asyncio.AbstractEventLoop] = None
+_sweep_loop_lock = threading.Lock()
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+def get_sweep_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop shared by all async sweeps, running on a daemon thread.
+
+    The pooled async client belongs to its loop, so keeping one loop alive
+    lets keep-alive connections and TLS sessions carry over from sweep to sweep.
+    """
+    global _sweep_loop
+    with _sweep_loop_lock:
+        if _sweep_loop is None:
+            _sweep_loop = asyncio.new_event_loop()
+            threading.Thread(target=_run_loop, args=(_sweep_loop,), name='sweep_loop', daemon=True).start()
+        return _sweep_loop
+
+
+def run_async_sweep(scrapers: List[BaseScraper], **kwargs) -> SweepResult:
+    """Run one async sweep on the shared sweep loop, blocking until it is done."""
+    return asyncio.run_coroutine_threadsafe(run_async(scrapers, **kwargs), get_sweep_loop()).result()
+
+
+def close_sweep_loop() -> None:
+    """Close the shared async client and stop the sweep loop; the next async sweep starts a new one."""
+    global _sweep_loop
+    with _sweep_loop_lock:
+        loop, _sweep_loop = _sweep_loop, None
+    if loop is None:
+        return
+    asyncio.run_coroutine_threadsafe(close_async_client(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from .models.product import Product
+
+if TYPE_CHECKING:
+    from .analytics import ProductTable
+
+DEFAULT_HISTORY_PATH = 'price_history.db'
+DAY = 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    store TEXT NOT NULL,
+    url TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (store, url)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    product_id INTEGER NOT NULL REFERENCES products(id),
+    observed_at REAL NOT NULL,
+    price REAL NOT NULL,
+    per_unit_price REAL,
+    package_size INTEGER,
+    stock INTEGER,
+    available INTEGER NOT NULL,
+    PRIMARY KEY (product_id, observed_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_observations_time ON observations (observed_at);
+"""
+
+
+class PriceHistory:
+    """
+    Persistent price history in SQLite.
+
+    Every observed Product is stored with a timestamp. Observations are
+    clustered on (product, time), so window queries for one product read a
+    contiguous range no matter how many rows the history holds.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._product_ids: Dict[Tuple[str, str], int] = {}
+
+    def _product_id(self, product: Product) -> int:
+        key = (product.store, product.url)
+        product_id = self._product_ids.get(key)
+        if product_id is None:
+            self._conn.execute(
+                'INSERT INTO products (store, url, name) VALUES (?, ?, ?) '
+                'ON CONFLICT (store, url) DO UPDATE SET name = excluded.name',
+                (product.store, product.url, product.name)
+            )
+            product_id = self._conn.execute(
+                'SELECT id FROM products WHERE store = ? AND url = ?', key
+            ).fetchone()[0]
+            self._product_ids[key] = product_id
+        return product_id
+
+    def record(self, products: List[Product], observed_at: Optional[float] = None) -> int:
+        """Store one sweep's products. Returns the number of observations written."""
+        observed_at = time.time() if observed_at is None else observed_at
+        with self._lock, self._conn:
+            rows = [
+                (self._product_id(p), observed_at, p.price, p.per_unit_price,
+                 p.package_size, p.stock, int(p.available))
+                for p in products
+            ]
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO observations '
+                '(product_id, observed_at, price, per_unit_price, package_size, stock, available) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+        return len(rows)
+
+    def _window(self, days: Optional[float], until: Optional[float]) -> Tuple[float, float]:
+        until = time.time() if until is None else until
+        since = until - days * DAY if days is not None else 0.0
+        return since, until
+
+    def price_stats(self,
+                    store: str,
+                    url: str,
+                    days: Optional[float] = 30,
+                    until: Optional[float] = None,
+                    unit_price: bool = False) -> Dict[str, Optional[float]]:
+        """Min/max/avg price of one product over the last `days` (all time if None)."""
+        since, until = self._window(days, until)
+        column = 'per_unit_price' if unit_price else 'price'
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT MIN(o.{column}), MAX(o.{column}), AVG(o.{column}), COUNT(o.{column}) '
+                'FROM observations o JOIN products p ON p.id = o.product_id '
+                'WHERE p.store = ? AND p.url = ? AND o.observed_at BETWEEN ? AND ?',
+                (store, url, since, until)
+            ).fetchone()
+        return {'min_price': row[0], 'max_price': row[1], 'avg_price': row[2], 'observations': row[3]}
+
+    def price_series(self,
+                     store: str,
+                     url: str,
+                     days: Optional[float] = 30,
+                     until: Optional[float] = None) -> List[Tuple[float, float]]:
+        """(timestamp, price) pairs of one product, oldest first."""
+        since, until = self._window(days, until)
+        with self._lock:
+            return self._conn.execute(
+                'SELECT o.observed_at, o.price '
+                'FROM observations o JOIN products p ON p.id = o.product_id '
+                'WHERE p.store = ? AND p.url = ? AND o.observed_at BETWEEN ? AND ? '
+                'ORDER BY o.observed_at',
+                (store, url, since, until)
+            ).fetchall()
+
+    def lowest_prices(self,
+                      days: Optional[float] = 30,
+                      until: Optional[float] = None,
+                      store: Optional[str] = None) -> List[Dict]:
+        """Lowest, highest and average price per product over a window, cheapest first."""
+        since, until = self._window(days, until)
+        query = (
+            'SELECT p.store, p.url, p.name, MIN(o.price), MAX(o.price), AVG(o.price) '
+            'FROM observations o JOIN products p ON p.id = o.product_id '
+            'WHERE o.observed_at BETWEEN ? AND ?'
+        )
+        params: list = [since, until]
+        if store:
+            query += ' AND p.store = ?'
+            params.append(store.lower())
+        query += ' GROUP BY o.product_id ORDER BY MIN(o.price)'
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {'store': r[0], 'url': r[1], 'name': r[2], 'min_price': r[3], 'max_price': r[4], 'avg_price': r[5]}
+            for r in rows
+        ]
+
+    def load_table(self,
+                   days: Optional[float] = 30,
+                   until: Optional[float] = None,
+                   store: Optional[str] = None) -> 'ProductTable':
+        """Observations in a window as a columnar ProductTable (requires numpy)."""
+        from .analytics import ProductTable
+
+        since, until = self._window(days, until)
+        query = (
+            'SELECT p.store, o.price, o.per_unit_price, o.package_size, o.stock, o.available, o.observed_at '
+            'FROM observations o JOIN products p ON p.id = o.product_id '
+            'WHERE o.observed_at BETWEEN ? AND ?'
+        )
+        params: list = [since, until]
+        if store:
+            query += ' AND p.store = ?'
+            params.append(store.lower())
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return ProductTable.from_rows(rows)
+
+    def is_lowest_price(self, product: Product, days: float = 30) -> bool:
+        """
+        Whether a product's current price is at or below anything seen in the window.
+
+        A discount that doesn't beat recent prices is usually a fake one,
+        marked down from a price that was raised shortly before.
+        """
+        stats = self.price_stats(product.store, product.url, days=days)
+        return stats['min_price'] is None or product.price <= stats['min_price']
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,195 @@
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from .models.product import Product
+
+MATCH_THRESHOLD = 0.6  # Minimum flavor token overlap (Jaccard) to join an existing SKU
+
+GRAMS_PATTERN = re.compile(r'(\d+)\s*(?:g|gr|gram)\b')
+TOKEN_PATTERN = re.compile(r'[a-zåäöé]+')
+
+# Words that describe the product line rather than the flavor
+STOPWORDS = {
+    'barebells', 'protein', 'proteinbar', 'proteinbars', 'proteinbarer', 'bar', 'bars', 'bit',
+    'st', 'pack', 'pk', 'x', 'g', 'gr', 'gram', 'ml', 'kg', 'smak', 'med', 'and', 'och', 'with',
+    'the', 'new', 'ny', 'nyhet', 'låda', 'box', 'flavour', 'flavor',
+}
+
+# Variants and the words that mark them
+VARIANT_WORDS = {
+    'soft': 'soft',
+    'chewy': 'chewy',
+    'vegan': 'vegan',
+    'plant': 'vegan',
+    'shake': 'shake',
+    'milkshake': 'shake',
+    'drink': 'shake',
+}
+
+# Swedish flavor words to their English names
+FLAVOR_SYNONYMS = {
+    'choklad': 'chocolate',
+    'chokladsmak': 'chocolate',
+    'jordgubb': 'strawberry',
+    'karamell': 'caramel',
+    'kola': 'caramel',
+    'kakor': 'cookies',
+    'cookie': 'cookies',
+    'hasselnöt': 'hazelnut',
+    'hasselnötter': 'hazelnut',
+    'jordnöt': 'peanut',
+    'jordnötter': 'peanut',
+    'mörk': 'dark',
+    'vit': 'white',
+    'salt': 'salty',
+    'creamy': 'cream',
+}
+
+
+@dataclass(frozen=True)
+class ProductIdentity:
+    """Normalized description of what a listing is."""
+    flavor: Tuple[str, ...]
+    variant: str
+    size: Optional[int] = None   # Grams per bar or ml per drink, if stated
+    pack: Optional[int] = None   # Bars per package
+
+
+@lru_cache(maxsize=4096)
+def _name_tokens(name: str) -> Tuple[Tuple[str, ...], str, Optional[int]]:
+    """(flavor tokens, variant, grams) for a product name, cached per unique name."""
+    name_lower = name.lower()
+    size_match = GRAMS_PATTERN.search(name_lower)
+    size = int(size_match.group(1)) if size_match else None
+
+    variant = 'bar'
+    flavor: Set[str] = set()
+    for token in TOKEN_PATTERN.findall(name_lower):
+        if token in VARIANT_WORDS:
+            variant = VARIANT_WORDS[token]
+        elif token not in STOPWORDS:
+            flavor.add(FLAVOR_SYNONYMS.get(token, token))
+    return tuple(sorted(flavor)), variant, size
+
+
+def identify(product: Product) -> ProductIdentity:
+    """Normalize a product's name into flavor, variant, size and pack."""
+    flavor, variant, size = _name_tokens(product.name)
+    return ProductIdentity(flavor=flavor, variant=variant, size=size, pack=product.package_size)
+
+
+def _similarity(a: Tuple[str, ...], b: Tuple[str, ...]) -> float:
+    union = len(set(a) | set(b))
+    return len(set(a) & set(b)) / union if union else 0.0
+
+
+@dataclass
+class CanonicalProduct:
+    """One flavor of one product line, as sold by any store in any pack size."""
+    sku: str
+    flavor: Tuple[str, ...]
+    variant: str
+    size: Optional[int] = None
+    listings: Dict[Tuple[str, str], Product] = field(default_factory=dict)  # (store, url) -> latest product
+
+
+class CanonicalCatalog:
+    """
+    Cross-store catalog mapping every listing to a canonical SKU.
+
+    Candidates are found through a blocking index on (variant, flavor
+    token), so resolving a new listing only compares it with SKUs of the
+    same variant sharing a flavor word. Listings are resolved once and
+    remembered by (store, url), so sweeps are mapped incrementally.
+    """
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.products: Dict[str, CanonicalProduct] = {}
+        self._blocks: Dict[Tuple[str, str], Set[str]] = {}
+        self._assignments: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def _candidates(self, identity: ProductIdentity) -> Set[str]:
+        candidates: Set[str] = set()
+        for token in identity.flavor:
+            candidates |= self._blocks.get((identity.variant, token), set())
+        return candidates
+
+    def _match(self, identity: ProductIdentity) -> Optional[str]:
+        best_sku, best_score = None, self.threshold
+        for sku in self._candidates(identity):
+            canonical = self.products[sku]
+            if identity.size and canonical.size and identity.size != canonical.size:
+                continue
+            score = _similarity(identity.flavor, canonical.flavor)
+            if score >= best_score:
+                best_sku, best_score = sku, score
+        return best_sku
+
+    def _create(self, identity: ProductIdentity) -> str:
+        sku = f"{identity.variant}:{'-'.join(identity.flavor)}"
+        if identity.size:
+            sku += f":{identity.size}g"
+        self.products[sku] = CanonicalProduct(sku, identity.flavor, identity.variant, identity.size)
+        for token in identity.flavor:
+            self._blocks.setdefault((identity.variant, token), set()).add(sku)
+        return sku
+
+    def resolve(self, product: Product) -> Optional[str]:
+        """
+        Canonical SKU of a listing, or None if its name has no flavor to go by.
+        """
+        key = (product.store, product.url)
+        if key in self._assignments:
+            sku = self._assignments[key]
+        else:
+            identity = identify(product)
+            if not identity.flavor:
+                sku = None
+            else:
+                sku = self._match(identity) or self._create(identity)
+            self._assignments[key] = sku
+
+        if sku is not None:
+            self.products[sku].listings[key] = product
+        return sku
+
+    def update(self, products: List[Product]) -> Dict[Tuple[str, str], Optional[str]]:
+        """
+        Map one sweep's products to SKUs.
+
+        Listings of the swept stores that are no longer offered are dropped
+        from the canonical products, so comparisons only use current prices.
+        """
+        swept_stores = {p.store for p in products}
+        current = {(p.store, p.url) for p in products}
+        for canonical in self.products.values():
+            for key in [k for k in canonical.listings if k[0] in swept_stores and k not in current]:
+                del canonical.listings[key]
+
+        return {(p.store, p.url): self.resolve(p) for p in products}
+
+    def find(self, text: str, variant: Optional[str] = None) -> List[str]:
+        """SKUs matching a free-text flavor such as 'salty peanut', best match first."""
+        flavor, text_variant, _ = _name_tokens(text)
+        query = ProductIdentity(flavor=flavor, variant=variant or text_variant)
+        scored = [(_similarity(flavor, self.products[sku].flavor), sku) for sku in self._candidates(query)]
+        return [sku for score, sku in sorted(scored, reverse=True) if score > 0]
+
+    def prices_for(self, sku: str, package_size: Optional[int] = None, only_available: bool = True) -> Dict[str, Product]:
+        """Cheapest listing per store for a SKU, by unit price, optionally for one pack size."""
+        canonical = self.products.get(sku)
+        if canonical is None:
+            return {}
+
+        unit_price = lambda p: p.per_unit_price if p.per_unit_price is not None else p.price
+        best: Dict[str, Product] = {}
+        for (store, _), product in canonical.listings.items():
+            if package_size is not None and product.package_size != package_size:
+                continue
+            if only_available and not product.available:
+                continue
+            if store not in best or unit_price(product) < unit_price(best[store]):
+                best[store] = product
+        return best
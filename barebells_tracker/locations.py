@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from .engine import run_on_daemon_threads
+from .models.product import Product
+from .scrapers.base import BaseScraper
+from .scrapers.client import MAX_CONNECTIONS, MAX_CONNECTIONS_PER_HOST
+
+logger = logging.getLogger(__name__)
+
+# Locations of one chain scraped at the same time; a chain is one host
+CHAIN_LIMITS: Dict[str, int] = {}
+DEFAULT_CHAIN_LIMIT = MAX_CONNECTIONS_PER_HOST
+
+LocationKey = Tuple[str, str]  # (store, location)
+
+
+def catalog_hash(products: List[Product]) -> str:
+    """
+    Digest of what a location sells and at what price.
+
+    URLs and the location itself are left out, so two locations with the
+    same assortment and prices hash the same even if their links differ.
+    """
+    rows = sorted(
+        (p.name, p.price, p.per_unit_price, p.package_size, p.stock, p.available)
+        for p in products
+    )
+    return hashlib.blake2b(repr(rows).encode('utf-8'), digest_size=16).hexdigest()
+
+
+@dataclass
+class LocationResult:
+    """Products of one store location."""
+    store: str
+    location: str
+    products: List[Product] = field(default_factory=list)
+    catalog_hash: Optional[str] = None
+    duplicate_of: Optional[str] = None  # First location with an identical catalog
+    error: Optional[str] = None
+
+
+@dataclass
+class LocationSweep:
+    """Outcome of one fan-out over store locations."""
+    results: Dict[LocationKey, LocationResult] = field(default_factory=dict)
+    timed_out: List[LocationKey] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def products(self, store: str, location: str) -> List[Product]:
+        result = self.results.get((store, location))
+        return result.products if result else []
+
+    def catalogs(self, store: str) -> Dict[str, List[str]]:
+        """Locations of a chain grouped by identical catalog, keyed by catalog hash."""
+        groups: Dict[str, List[str]] = {}
+        for (result_store, location), result in self.results.items():
+            if result_store == store and result.catalog_hash is not None:
+                groups.setdefault(result.catalog_hash, []).append(location)
+        return groups
+
+
+def run_locations(chains: Dict[Type[BaseScraper], List[str]],
+                  chain_limits: Optional[Dict[str, int]] = None,
+                  max_workers: int = MAX_CONNECTIONS,
+                  deadline: Optional[float] = None,
+                  prepare: Optional[Callable[[BaseScraper], None]] = None,
+                  on_result: Optional[Callable[[LocationResult], None]] = None) -> LocationSweep:
+    """
+    Scrape many locations of location-priced chains concurrently.
+
+    Args:
+        chains: Scraper class -> location IDs; each class is built as cls(location)
+        chain_limits: Locations of one chain scraped at once, by store name.
+            Defaults to CHAIN_LIMITS, then the per-host connection limit
+        max_workers: Global limit on locations scraped at once
+        deadline: Seconds to wait for the whole fan-out
+        prepare: Called with each scraper after it is built, e.g. to attach caches
+        on_result: Called with each location's result as soon as it is done,
+            failed ones included. duplicate_of is not set yet at that point
+
+    Returns:
+        LocationSweep with one result per location; after the fan-out,
+        locations whose catalog hashes the same as one earlier in the
+        input order are marked as its duplicate
+    """
+    start = time.monotonic()
+    deadline_at = start + deadline if deadline is not None else None
+    limits = {**CHAIN_LIMITS, **(chain_limits or {})}
+    scrapers = [cls(location) for cls, locations in chains.items() for location in locations]
+    if prepare is not None:
+        for scraper in scrapers:
+            prepare(scraper)
+    sweep = LocationSweep()
+    if not scrapers:
+        return sweep
+
+    semaphores: Dict[str, threading.Semaphore] = {}
+    for scraper in scrapers:
+        if scraper.store_name not in semaphores:
+            semaphores[scraper.store_name] = threading.Semaphore(limits.get(scraper.store_name, DEFAULT_CHAIN_LIMIT))
+
+    def scrape(scraper: BaseScraper) -> LocationResult:
+        result = LocationResult(scraper.store_name, scraper.location)
+        try:
+            with semaphores[scraper.store_name]:
+                scraper.deadline_at = deadline_at
+                result.products = scraper.scrape_products()
+        except Exception as e:
+            logger.error("Error scraping %s location %s: %s", scraper.store_name, scraper.location, e)
+            result.error = str(e)
+
+        if result.products:
+            result.catalog_hash = catalog_hash(result.products)
+        if on_result is not None:
+            try:
+                on_result(result)
+            except Exception as e:
+                logger.error("Error in location callback: %s", e)
+        return result
+
+    futures = run_on_daemon_threads(scrape, scrapers, max_workers, 'location')
+    _, not_done = wait(futures, timeout=deadline)
+    for future in not_done:
+        future.cancel()
+
+    for scraper, future in zip(scrapers, futures):
+        key = (scraper.store_name, scraper.location)
+        if future in not_done:
+            sweep.timed_out.append(key)
+        else:
+            sweep.results[key] = future.result()
+
+    # In input order, so the same location is canonical on every run
+    first_location: Dict[Tuple[str, str], str] = {}  # (store, catalog hash) -> location
+    for result in sweep.results.values():
+        if result.catalog_hash is not None:
+            first = first_location.setdefault((result.store, result.catalog_hash), result.location)
+            if first != result.location:
+                result.duplicate_of = first
+    sweep.elapsed = time.monotonic() - start
+    return sweep
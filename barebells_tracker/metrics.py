@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from .scrapers.retry import LatencyHistogram
+
+# Stages timed per store
+FETCH = 'fetch'          # Whole request, headers and body
+CONNECT = 'connect'      # TCP connect, async client only
+TLS = 'tls'              # TLS handshake, async client only
+TTFB = 'ttfb'            # Request sent until response headers received
+DECODE = 'decode'
+PARSE = 'parse'          # Parsing, including building Product objects
+NORMALIZE = 'normalize'
+SCRAPE = 'scrape'        # Whole store, all URLs and pages
+SWEEP = 'sweep'          # Whole sweep, all stores (store label 'all')
+
+# Counters per store
+REQUESTS = 'requests'
+BYTES = 'bytes'
+PRODUCTS = 'products'
+ERRORS = 'errors'
+TIMEOUTS = 'timeouts'    # Stores dropped for missing the sweep deadline
+
+PROMETHEUS_PREFIX = 'barebells'
+
+# Bucket upper bounds: 50 us to about a minute, 50% apart, fine enough for decode and parse
+STAGE_BUCKETS = tuple(0.00005 * 1.5 ** i for i in range(36))
+
+Labels = Tuple[str, str]  # (stage or counter, store)
+
+
+class MetricsRegistry:
+    """
+    Per-store stage latency histograms and counters for sweeps.
+
+    Exported as Prometheus text exposition (to_prometheus) or as a JSON
+    run report (report / to_json).
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._histograms: Dict[Labels, LatencyHistogram] = {}
+        self._counters: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, store: str, seconds: float) -> None:
+        """Record one duration of a stage."""
+        key = (stage, store)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram(STAGE_BUCKETS))
+        histogram.record(seconds)
+
+    def inc(self, counter: str, store: str, value: float = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self._counters[(counter, store)] = self._counters.get((counter, store), 0) + value
+
+    @contextmanager
+    def timer(self, stage: str, store: str) -> Iterator[None]:
+        """Time the enclosed block as one observation of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, store, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    def report(self) -> Dict:
+        """Per-store stage timings (count, total, mean, p50, p95) and counters."""
+        stores: Dict[str, Dict] = {}
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = list(self._counters.items())
+        for (stage, store), histogram in sorted(histograms):
+            stats = {
+                'count': histogram.count,
+                'total_seconds': histogram.total,
+                'mean_seconds': histogram.total / histogram.count if histogram.count else None,
+                'p50_seconds': histogram.quantile(0.5, min_samples=1),
+                'p95_seconds': histogram.quantile(0.95, min_samples=1),
+            }
+            stores.setdefault(store, {'stages': {}, 'counters': {}})['stages'][stage] = stats
+        for (counter, store), value in sorted(counters):
+            stores.setdefault(store, {'stages': {}, 'counters': {}})['counters'][counter] = value
+        return {'started': self.started, 'generated': time.time(), 'stores': stores}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.report(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition of all histograms and counters."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        name = f'{PROMETHEUS_PREFIX}_stage_duration_seconds'
+        lines = [f'# HELP {name} Duration of a scrape stage per store.', f'# TYPE {name} histogram']
+        for (stage, store), histogram in histograms:
+            labels = f'stage="{stage}",store="{store}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.total:.6f}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+        by_counter: Dict[str, list] = {}
+        for (counter, store), value in counters:
+            by_counter.setdefault(counter, []).append((store, value))
+        for counter, values in by_counter.items():
+            name = f'{PROMETHEUS_PREFIX}_{counter}_total'
+            lines.append(f'# TYPE {name} counter')
+            for store, value in values:
+                lines.append(f'{name}{{store="{store}"}} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+
+class HTTPXTrace:
+    """httpx trace extension recording connect, TLS and time-to-first-byte of one request."""
+
+    def __init__(self, metrics: MetricsRegistry, store: str):
+        self.metrics = metrics
+        self.store = store
+        self._started: Dict[str, float] = {}
+
+    async def __call__(self, event: str, info: Dict) -> None:
+        now = time.perf_counter()
+        if event.endswith('.started'):
+            step = event[:-len('.started')]
+            self._started[step] = now
+            if step.endswith('send_request_headers'):
+                self._started.setdefault('request', now)
+            return
+        if not event.endswith('.complete'):
+            return
+        step = event[:-len('.complete')]
+        if step == 'connection.connect_tcp' and step in self._started:
+            self.metrics.observe(CONNECT, self.store, now - self._started[step])
+        elif step == 'connection.start_tls' and step in self._started:
+            self.metrics.observe(TLS, self.store, now - self._started[step])
+        elif step.endswith('receive_response_headers') and 'request' in self._started:
+            self.metrics.observe(TTFB, self.store, now - self._started['request'])
@@ -1,8 +1,35 @@
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
 import re
+import sys
 
-@dataclass
+# Patterns like "12x55g", "12 st" and "12 pack"
+PACKAGE_SIZE_PATTERNS = [
+    re.compile(r'(\d+)\s*x\s*\d+g'),
+    re.compile(r'(\d+)\s*st\b'),
+    re.compile(r'(\d+)\s*pack\b'),
+]
+
+
+@lru_cache(maxsize=4096)
+def detect_package_size_from_name(name: str) -> Optional[int]:
+    """Package size stated in a product name, cached per unique name."""
+    name_lower = name.lower()
+
+    # Method 1: Check name for explicit package size
+    if '12-pack' in name_lower:
+        return 12
+
+    # Method 2: Check for patterns like "12x55g" or "12 st"
+    for pattern in PACKAGE_SIZE_PATTERNS:
+        match = pattern.search(name_lower)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+@dataclass(slots=True)
 class Product:
     name: str
     price: float
@@ -12,39 +39,44 @@ class Product:
     package_size: Optional[int] = None
     stock: Optional[int] = None
     available: bool = True
+    location: Optional[str] = None  # Store location within a chain, for location-priced chains
 
     def __post_init__(self):
         """
         Post-initialization processing:
-        1. Detect package size if not provided
-        2. Calculate per_unit_price if not provided
+        1. Intern the store name, shared by every product of the store
+        2. Detect package size if not provided
+        3. Calculate per_unit_price if not provided
         """
+        self.store = sys.intern(self.store)
         self._detect_package_size()
         self._calculate_per_unit_price()
 
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence]) -> List['Product']:
+        """
+        Build products in bulk from parsed rows.
+
+        Rows are sequences in field order: (name, price, url, store,
+        per_unit_price, package_size, stock, available, location), trailing fields optional.
+        """
+        return [cls(*row) for row in rows]
+
+    def to_row(self) -> tuple:
+        """Compact tuple in field order, the inverse of from_rows."""
+        return (self.name, self.price, self.url, self.store, self.per_unit_price,
+                self.package_size, self.stock, self.available, self.location)
+
     def _detect_package_size(self):
         """Detect package size using various methods."""
         if self.package_size is not None:
             return
 
-        # Method 1: Check name for explicit package size
-        if '12-pack' in self.name.lower():
-            self.package_size = 12
+        # Methods 1 and 2: explicit size in the name
+        self.package_size = detect_package_size_from_name(self.name)
+        if self.package_size is not None:
             return
 
-        # Method 2: Check for patterns like "12x55g" or "12 st"
-        patterns = [
-            r'(\d+)\s*x\s*\d+g',  # matches "12x55g"
-            r'(\d+)\s*st\b',      # matches "12 st"
-            r'(\d+)\s*pack\b',    # matches "12 pack"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, self.name.lower())
-            if match:
-                self.package_size = int(match.group(1))
-                return
-
         # Method 3: Price-based heuristic
         # If price is above 100 SEK and no other size detected, likely a multipack
         if self.price > 100:
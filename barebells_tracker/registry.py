@@ -0,0 +1,67 @@
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from .scrapers.base import BaseScraper
+
+# Entry point group third-party packages register extra scrapers under (name = module:Class)
+ENTRY_POINT_GROUP = 'barebells_tracker.scrapers'
+
+# Built-in scrapers by store name, as (module, class), in default sweep order.
+# Modules are only imported when their store is requested.
+SCRAPERS: Dict[str, Tuple[str, str]] = {
+    'tyngre': ('barebells_tracker.scrapers.tyngre', 'TyngreScraper'),
+    'apotea': ('barebells_tracker.scrapers.apotea', 'ApoteaScraper'),
+    'apohem': ('barebells_tracker.scrapers.apohem', 'ApohemScraper'),
+    'meds': ('barebells_tracker.scrapers.meds', 'MedsScraper'),
+    'torebrings': ('barebells_tracker.scrapers.torebrings', 'TorebringsScraper'),
+    'sportkost': ('barebells_tracker.scrapers.sportkost', 'SportkostScraper'),
+    'gymgrossisten': ('barebells_tracker.scrapers.gymgrossisten', 'GymgrossistenScraper'),
+    'mmsports': ('barebells_tracker.scrapers.mmsports', 'MMSportsScraper'),
+    'hemkop': ('barebells_tracker.scrapers.hemkop', 'HemkopScraper'),
+    'willys': ('barebells_tracker.scrapers.willys', 'WillysScraper'),
+    'ica': ('barebells_tracker.scrapers.ica', 'ICAScraper'),
+}
+
+_plugins: Optional[Dict[str, Tuple[str, str]]] = None
+_plugins_lock = threading.Lock()
+
+
+def _plugin_scrapers() -> Dict[str, Tuple[str, str]]:
+    """Scrapers registered through entry points, read from package metadata once."""
+    global _plugins
+    with _plugins_lock:
+        if _plugins is None:
+            plugins = {}
+            for entry in entry_points(group=ENTRY_POINT_GROUP):
+                module, _, attr = entry.value.partition(':')
+                plugins[entry.name.lower()] = (module.strip(), attr.strip())
+            _plugins = plugins
+    return _plugins
+
+
+def available_stores() -> List[str]:
+    """Names of every known store: built-ins in default order, then plugins."""
+    return list(SCRAPERS) + [name for name in _plugin_scrapers() if name not in SCRAPERS]
+
+
+def get_scraper_class(store: str) -> Type['BaseScraper']:
+    """Import and return the scraper class for a store name."""
+    name = store.strip().lower()
+    # Built-ins first, so the plugin scan only runs for names we don't know
+    target = SCRAPERS.get(name) or _plugin_scrapers().get(name)
+    if target is None:
+        raise ValueError(f"Unknown store: {store} (available: {', '.join(available_stores())})")
+    module, qualname = target
+    cls = importlib.import_module(module)
+    for attr in qualname.split('.'):
+        cls = getattr(cls, attr)
+    return cls
+
+
+def create_scrapers(stores: Optional[Iterable[str]] = None) -> List['BaseScraper']:
+    """Instantiate scrapers for the given store names, or all built-in stores."""
+    names = list(SCRAPERS) if stores is None else list(stores)
+    return [get_scraper_class(name)() for name in names]
@@ -0,0 +1,191 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from .changes import AVAILABILITY, PRICE_DROP, PRICE_RISE
+from .scrapers.base import BaseScraper
+
+if TYPE_CHECKING:
+    from .tracker import BarebellsTracker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 60 * 60        # Starting poll interval for stores without a hint
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 24 * 60 * 60
+MAX_BACKOFF = 6 * 60 * 60         # Longest wait after repeated failures
+JITTER = 0.1                      # Poll times are spread by +-10%
+SPEEDUP = 0.5                     # Interval factor after a poll that saw price changes
+SLOWDOWN = 1.5                    # Interval factor after a poll that saw none
+
+# Starting intervals; they adapt to each store's observed change rate
+STORE_INTERVALS = {
+    'ica': 6 * 60 * 60,           # Weekly promo cycles
+    'willys': 6 * 60 * 60,
+    'hemkop': 6 * 60 * 60,
+    'tyngre': 15 * 60,            # Flash sales
+}
+
+# Changes that count as the store's prices moving
+PRICE_CHANGES = {PRICE_DROP, PRICE_RISE, AVAILABILITY}
+
+
+@dataclass
+class StoreSchedule:
+    """Polling state of one store."""
+    scraper: BaseScraper
+    interval: float
+    min_interval: float = MIN_INTERVAL
+    max_interval: float = MAX_INTERVAL
+    failures: int = 0             # Consecutive failed polls
+    polls: int = 0
+    successful_polls: int = 0
+    changed_polls: int = 0
+    last_polled: Optional[float] = None
+    last_changed: Optional[float] = None
+
+    @property
+    def change_rate(self) -> float:
+        """Fraction of successful polls that saw price changes."""
+        return self.changed_polls / self.successful_polls if self.successful_polls else 0.0
+
+
+@dataclass(order=True)
+class _Due:
+    at: float
+    seq: int
+    store: str = field(compare=False)
+
+
+class PollScheduler:
+    """
+    Long-running poller giving every store its own adaptive interval.
+
+    Next-due polls are kept in a priority queue. After a poll that saw
+    price changes the store's interval shrinks; after one that saw none it
+    grows, within the store's bounds. Failed polls (errors or no products)
+    back off exponentially without touching the interval, and every delay
+    is jittered so stores don't fall into lockstep.
+    """
+
+    def __init__(self,
+                 tracker: 'BarebellsTracker',
+                 default_interval: float = DEFAULT_INTERVAL,
+                 jitter: float = JITTER,
+                 max_backoff: float = MAX_BACKOFF,
+                 clock: Callable[[], float] = time.monotonic):
+        self.tracker = tracker
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.schedules: Dict[str, StoreSchedule] = {}
+        self._queue: List[_Due] = []
+        self._seq = 0
+        self._stop = threading.Event()
+
+        for scraper in tracker.scrapers:
+            self.schedule(scraper)
+
+    def schedule(self,
+                 scraper: BaseScraper,
+                 interval: Optional[float] = None,
+                 min_interval: float = MIN_INTERVAL,
+                 max_interval: float = MAX_INTERVAL,
+                 delay: float = 0) -> StoreSchedule:
+        """Add a store, first polled after `delay` seconds."""
+        store = scraper.store_name
+        if interval is None:
+            interval = STORE_INTERVALS.get(store, self.default_interval)
+        interval = min(max(interval, min_interval), max_interval)
+        self.schedules[store] = StoreSchedule(scraper, interval, min_interval, max_interval)
+        self._push(store, delay)
+        return self.schedules[store]
+
+    def _push(self, store: str, delay: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._queue, _Due(self.clock() + delay, self._seq, store))
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next poll is due, or None if nothing is scheduled."""
+        if not self._queue:
+            return None
+        return max(0.0, self._queue[0].at - self.clock())
+
+    def poll(self, store: str) -> bool:
+        """Poll one store now and reschedule it. Returns whether the poll succeeded."""
+        schedule = self.schedules[store]
+        schedule.polls += 1
+        schedule.last_polled = time.time()
+        try:
+            products = schedule.scraper.scrape_products()
+        except Exception as e:
+            logger.error("Error polling %s: %s", store, e)
+            products = []
+
+        if not products:
+            # Scrapers log and swallow per-URL errors, so nothing found means it failed
+            schedule.failures += 1
+            backoff = min(schedule.interval * 2 ** schedule.failures, max(self.max_backoff, schedule.interval))
+            self._push(store, self._jittered(backoff))
+            return False
+
+        schedule.failures = 0
+        schedule.successful_polls += 1
+        changes = self.tracker.update_store(store, products)
+        if any(change.kind in PRICE_CHANGES for change in changes):
+            schedule.changed_polls += 1
+            schedule.last_changed = schedule.last_polled
+            schedule.interval = max(schedule.interval * SPEEDUP, schedule.min_interval)
+        else:
+            schedule.interval = min(schedule.interval * SLOWDOWN, schedule.max_interval)
+        self._push(store, self._jittered(schedule.interval))
+        return True
+
+    def run_pending(self) -> List[str]:
+        """Poll every store that is due now. Returns the polled stores."""
+        polled = []
+        while self._queue and self._queue[0].at <= self.clock() and not self._stop.is_set():
+            due = heapq.heappop(self._queue)
+            if due.store in self.schedules:
+                self.poll(due.store)
+                polled.append(due.store)
+        return polled
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """Poll until stop() is called, or after max_polls polls."""
+        self._stop.clear()
+        polls = 0
+        while not self._stop.is_set():
+            wait = self.next_due()
+            if wait is None:
+                return
+            if wait > 0 and self._stop.wait(wait):
+                return
+            polls += len(self.run_pending())
+            if max_polls is not None and polls >= max_polls:
+                return
+
+    def stop(self) -> None:
+        """Make run() return after the current poll."""
+        self._stop.set()
+
+    def status(self) -> Dict[str, Dict]:
+        """Interval, change rate and failure count per store."""
+        return {
+            store: {
+                'interval': s.interval,
+                'change_rate': s.change_rate,
+                'failures': s.failures,
+                'polls': s.polls,
+                'last_polled': s.last_polled,
+                'last_changed': s.last_changed,
+            }
+            for store, s in self.schedules.items()
+        }
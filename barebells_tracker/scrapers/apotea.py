@@ -2,10 +2,14 @@ import re
 import logging
 from typing import Dict, List, Optional
 from ..models.product import Product
-from .base import BaseScraper
-from bs4 import BeautifulSoup
+from .base import BaseScraper, ResponseType
+from .html_parser import select
+
+logger = logging.getLogger(__name__)
 
 class ApoteaScraper(BaseScraper):
+    response_type = ResponseType.HTML
+
     def get_headers(self) -> Dict:
         return {
             'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0',
@@ -29,32 +33,10 @@ class ApoteaScraper(BaseScraper):
                 pass
         return None
 
-    def scrape_products(self) -> List[Product]:
-        """Main scraping method - overridden for HTML handling."""
-        products = []
-        urls = self.get_product_urls()
-        
-        for url in urls:
-            try:
-                response = self.session.get(
-                    url, 
-                    headers=self.get_headers(),
-                    timeout=10
-                )
-                response.raise_for_status()
-                products.extend(self.parse_products(response.text))
-            except Exception as e:
-                logging.error(f"Error scraping {url}: {str(e)}")
-                continue
-        
-        return products
-
     def parse_products(self, html_content: str) -> List[Product]:
         products = []
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
         # Find all product blocks
-        product_blocks = soup.find_all('div', class_='product-block-container')
+        product_blocks = select(html_content, 'div', 'product-block-container')
         
         for block in product_blocks:
             try:
@@ -98,12 +80,12 @@ class ApoteaScraper(BaseScraper):
                 
                 # Log with package size info if present
                 if package_size:
-                    logging.info(f"Found multipack: {name} ({package_size} st) at {price} SEK")
+                    logger.debug("Found multipack: %s (%s st) at %s SEK", name, package_size, price)
                 else:
-                    logging.info(f"Found product: {name} at {price} SEK")
+                    logger.debug("Found product: %s at %s SEK", name, price)
                 
             except Exception as e:
-                logging.error(f"Error processing product block: {str(e)}")
+                logger.error("Error processing product block: %s", e)
                 continue
                 
         return products
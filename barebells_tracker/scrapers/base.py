@@ -1,17 +1,134 @@
 from abc import ABC, abstractmethod
-import requests
+import asyncio
+import hashlib
+import importlib.util
+import json
 import logging
-from typing import Dict, List
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from ..models.product import Product
+from ..metrics import BYTES, DECODE, ERRORS, FETCH, NORMALIZE, PARSE, PRODUCTS, REQUESTS, SCRAPE, TTFB, HTTPXTrace, MetricsRegistry
+from .client import MAX_CONNECTIONS_PER_HOST, get_async_client, get_session
+from .http_cache import CacheEntry, HTTPCache, get_header
+from .retry import DeadlineExceededError, LatencyHistogram, RetryPolicy, async_hedged, get_latency_histogram, hedged
+from .throttle import (DEFAULT_BURST, DEFAULT_FAILURE_THRESHOLD, DEFAULT_MAX_RESET_TIMEOUT, DEFAULT_RATE,
+                       DEFAULT_RESET_TIMEOUT, CircuitBreaker, TokenBucket, get_host_guards)
+
+if TYPE_CHECKING:
+    from .fixtures import FixtureCorpus
+    from .parse_memo import ParseMemo
+    from .parse_pool import ParsePool
+
+logger = logging.getLogger(__name__)
+
+
+# Attributes parse workers never see: clients and caches shared between scrapers, which
+# they could not pickle, and per-sweep settings, which would make every sweep's state new
+SHARED_STATE = {'session', 'http_cache', 'parse_memo', 'fixture_corpus', 'metrics', 'parse_pool', 'deadline_at'}
+
+
+class ResponseType(str, Enum):
+    """How a store's response body is decoded before parsing."""
+    JSON = 'json'
+    HTML = 'html'
+    JSON_HTML = 'json_html'  # JSON envelope with an HTML fragment inside
+
+
+@dataclass
+class FetchResult:
+    """Raw response of one fetch, independent of the HTTP client used."""
+    url: str
+    status_code: int
+    text: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    not_modified: bool = False
+    # Products already parsed from this exact body, e.g. on a 304 from the HTTP cache
+    products: Optional[List[Product]] = None
+
+
+def with_query_params(url: str, **params) -> str:
+    """URL with the given query parameters set, keeping all others."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+# Modules outside scraper class hierarchies whose code shapes parsed products
+PARSER_MODULES = ('barebells_tracker.scrapers.html_parser', 'barebells_tracker.models.product')
+
+
+def _module_file(name: str) -> Optional[str]:
+    """Source file of a module, found without importing it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return getattr(module, '__file__', None)
+    spec = importlib.util.find_spec(name)
+    return spec.origin if spec is not None and spec.has_location else None
+
+
+@lru_cache(maxsize=None)
+def parser_version(cls: type) -> str:
+    """Digest of the source of every module in a scraper class's hierarchy and of PARSER_MODULES."""
+    digest = hashlib.blake2b(digest_size=8)
+    sources = [(klass.__qualname__, klass.__module__) for klass in cls.__mro__]
+    sources += [(name, name) for name in PARSER_MODULES]
+    for label, module in sources:
+        path = _module_file(module)
+        if path is None:
+            continue  # Built-ins
+        digest.update(label.encode())
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
 
 class BaseScraper(ABC):
+    # Fetch pipeline settings, overridden per store
+    response_type: ResponseType = ResponseType.JSON
+    embedded_html_key: str = 'result'  # Key holding the HTML for JSON_HTML responses
+    timeout: float = 10
+    http_cache: Optional[HTTPCache] = None
+    parse_memo: Optional['ParseMemo'] = None
+    fixture_corpus: Optional['FixtureCorpus'] = None
+    fixture_mode: str = 'replay'  # 'record' saves live responses, 'replay' serves saved ones
+    metrics: Optional[MetricsRegistry] = None
+    parse_pool: Optional['ParsePool'] = None  # Parses HTML responses in worker processes
+    location: Optional[str] = None  # Store location for chains priced per location
+    # Per-host request budget and failure handling, shared with other scrapers of the host
+    rate_limit: Optional[float] = DEFAULT_RATE  # Requests per second, None for unlimited
+    rate_burst: int = DEFAULT_BURST
+    breaker_failures: int = DEFAULT_FAILURE_THRESHOLD
+    breaker_reset: float = DEFAULT_RESET_TIMEOUT
+    breaker_max_reset: float = DEFAULT_MAX_RESET_TIMEOUT
+    # Retries of failed GETs, and a second request when the first is slower than usual
+    retry_policy: RetryPolicy = RetryPolicy()
+    hedge_quantile: Optional[float] = 0.95  # Latency quantile after which to hedge, None to never hedge
+    # Monotonic time the running sweep must finish by; set by the sweep engine, None for no limit
+    deadline_at: Optional[float] = None
+    # Pagination settings, for stores implementing get_page_urls
+    max_pages: int = 20
+    page_concurrency: int = MAX_CONNECTIONS_PER_HOST  # Pages fetched at once, within the per-host limit
+
     def __init__(self):
-        self.session = requests.Session()
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-    
+        # Pooled session shared with every other scraper
+        self.session = get_session()
+
+    @property
+    def store_name(self) -> str:
+        """Store identifier, matching the store field of scraped products."""
+        return self.__class__.__name__.replace('Scraper', '').lower()
+
     @abstractmethod
     def get_headers(self) -> Dict:
         """Return headers required for the specific vendor."""
@@ -23,27 +140,411 @@ class BaseScraper(ABC):
         pass
 
     @abstractmethod
-    def parse_products(self, response_data: Dict) -> List[Product]:
-        """Parse the response data into Product objects."""
+    def parse_products(self, response_data: Any) -> List[Product]:
+        """Parse the decoded response (dict for JSON, str for HTML) into Product objects."""
         pass
 
+    def parse_state(self) -> Dict:
+        """Instance state a parse worker needs to rebuild this scraper, without shared clients and caches."""
+        return {key: value for key, value in vars(self).items() if key not in SHARED_STATE}
+
+    def _offload_parse(self) -> bool:
+        """Whether parsing goes to the parse pool; only HTML parsing is CPU-heavy enough to pay for the hop."""
+        return self.parse_pool is not None and self.response_type != ResponseType.JSON
+
+    @property
+    def memo_scope(self) -> str:
+        """
+        Parse memo namespace. Parsed products depend on the location they
+        were fetched for and on the parsing code, so both are part of it.
+        """
+        scope = self.store_name if self.location is None else f"{self.store_name}@{self.location}"
+        return f"{scope}#{parser_version(type(self))}"
+
+    def get_page_urls(self, result: FetchResult) -> List[str]:
+        """
+        URLs of the pages following a first page, read from its total-count metadata.
+
+        Stores with paginated APIs override this; the default is a single page.
+        """
+        return []
+
+    def get_request_params(self) -> Optional[Dict]:
+        """Return query parameters sent with every request, if any."""
+        return None
+
+    def cache_key(self, url: str) -> str:
+        """Key identifying a request in the HTTP cache."""
+        params = self.get_request_params()
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def _cached_entry(self, url: str) -> Optional[CacheEntry]:
+        """
+        Cached entry of a URL, if its products came from the current parser.
+
+        A 304 serves the cached products as they are, so entries parsed by
+        other code are ignored and the URL is fetched unconditionally.
+        """
+        if self.http_cache is None:
+            return None
+        entry = self.http_cache.get(self.cache_key(url))
+        if entry is None or entry.parser != self.memo_scope:
+            return None
+        return entry
+
+    def _request_headers(self, entry: Optional[CacheEntry]) -> Dict:
+        """Vendor headers, made conditional when a cached entry exists."""
+        headers = self.get_headers()
+        if entry is not None:
+            headers = {**headers, **entry.validators()}
+        return headers
+
+    def _to_result(self, url: str, response, entry: Optional[CacheEntry]) -> FetchResult:
+        """Build a FetchResult from a requests or httpx response."""
+        if response.status_code == 304 and entry is not None:
+            return FetchResult(url, 304, entry.text, dict(response.headers),
+                               not_modified=True, products=entry.products)
+        response.raise_for_status()
+        return FetchResult(url, response.status_code, response.text, dict(response.headers))
+
+    def _replaying(self) -> bool:
+        return self.fixture_corpus is not None and self.fixture_mode == 'replay'
+
+    def _record(self, result: FetchResult) -> FetchResult:
+        """Save a live response to the fixture corpus when recording."""
+        if self.fixture_corpus is not None and self.fixture_mode == 'record' and not result.not_modified:
+            self.fixture_corpus.record(self.store_name, self.cache_key(result.url), result)
+        return result
+
+    def _host_guards(self, url: str) -> Tuple[Optional[TokenBucket], CircuitBreaker, bool]:
+        """
+        Rate limiter and circuit breaker of the URL's host, and whether this request is the breaker's probe.
+
+        Raises CircuitOpenError straight away if the host keeps failing.
+        """
+        bucket, breaker = get_host_guards(
+            urlsplit(url).hostname or '',
+            rate=self.rate_limit,
+            burst=self.rate_burst,
+            failure_threshold=self.breaker_failures,
+            reset_timeout=self.breaker_reset,
+            max_reset_timeout=self.breaker_max_reset
+        )
+        return bucket, breaker, breaker.before_request()
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, response) -> None:
+        """Server errors and throttling count against the host; anything else is a working host."""
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _timed(self, stage: str):
+        """Context timing a stage for this store when metrics are enabled."""
+        return self.metrics.timer(stage, self.store_name) if self.metrics is not None else nullcontext()
+
+    @staticmethod
+    def _wire_bytes(response) -> int:
+        """Body bytes as transferred, before content decoding, for requests or httpx responses."""
+        downloaded = getattr(response, 'num_bytes_downloaded', None)  # httpx
+        if downloaded is None:
+            try:
+                downloaded = response.raw.tell()  # urllib3 counts what it read off the socket
+            except (AttributeError, TypeError, ValueError):
+                downloaded = None
+        if downloaded:
+            return downloaded
+        length = response.headers.get('Content-Length')  # Case-insensitive in both clients
+        return int(length) if length and length.isdigit() else len(response.content)
+
+    def _record_response(self, response, seconds: float, ttfb: Optional[float] = None) -> None:
+        """Record a response of any status, before errors are raised for it."""
+        self.latency.record(seconds)
+        if self.metrics is not None:
+            self.metrics.observe(FETCH, self.store_name, seconds)
+            if ttfb is not None:
+                self.metrics.observe(TTFB, self.store_name, ttfb)
+            self.metrics.inc(REQUESTS, self.store_name)
+            self.metrics.inc(BYTES, self.store_name, self._wire_bytes(response))
+
+    def _scrape_failed(self, url: str, error: Exception) -> None:
+        logger.error("Error scraping %s: %s", url, error)
+        if self.metrics is not None:
+            self.metrics.inc(ERRORS, self.store_name)
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        """Response times of this store's requests."""
+        return get_latency_histogram(self.store_name)
+
+    def _hedge_after(self) -> Optional[float]:
+        """Seconds after which a request is hedged, once the store has enough latency samples."""
+        if self.hedge_quantile is None:
+            return None
+        threshold = self.latency.quantile(self.hedge_quantile)
+        return threshold if threshold is not None and threshold < self.timeout else None
+
+    def _request_timeout(self) -> float:
+        """Request timeout, cut short by the sweep deadline; raises DeadlineExceededError once it has passed."""
+        if self.deadline_at is None:
+            return self.timeout
+        left = self.deadline_at - time.monotonic()
+        if left <= 0:
+            raise DeadlineExceededError(f"{self.store_name} ran past its sweep deadline")
+        return min(self.timeout, left)
+
+    def _send(self, url: str, entry: Optional[CacheEntry]) -> FetchResult:
+        """One request attempt, within the host's rate limit and circuit breaker."""
+        timeout = self._request_timeout()
+        bucket, breaker, probe = self._host_guards(url)
+        try:
+            if bucket is not None:
+                bucket.acquire()
+            start = time.monotonic()
+            response = self.session.get(
+                url,
+                headers=self._request_headers(entry),
+                params=self.get_request_params(),
+                timeout=timeout
+            )
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            if probe:
+                breaker.release_probe()  # Interrupted, which says nothing about the host
+            raise
+        self._record_outcome(breaker, response)
+        self._record_response(response, time.monotonic() - start, response.elapsed.total_seconds())
+        return self._to_result(url, response, entry)
+
+    # Pipeline stages: fetch -> decode -> parse -> normalize
+
+    def fetch(self, url: str) -> FetchResult:
+        """Fetch a URL through the shared session, with retries and hedging."""
+        if self._replaying():
+            return self.fixture_corpus.load(self.store_name, self.cache_key(url))
+
+        entry = self._cached_entry(url)
+        result = self.retry_policy.call(
+            lambda: hedged(lambda: self._send(url, entry), self._hedge_after()),
+            deadline=self.deadline_at
+        )
+        return self._record(result)
+
+    def decode(self, result: FetchResult) -> Any:
+        """Decode the response body according to response_type."""
+        if self.response_type == ResponseType.HTML:
+            return result.text
+        data = json.loads(result.text)
+        if self.response_type == ResponseType.JSON_HTML:
+            return data.get(self.embedded_html_key, '')
+        return data
+
+    def normalize(self, products: List[Product]) -> List[Product]:
+        """Post-process parsed products. Hook for store-specific cleanup."""
+        return products
+
+    def process(self, result: FetchResult) -> List[Product]:
+        """Run a fetched response through decode, parse and normalize."""
+        if result.products is not None:
+            return list(result.products)
+
+        products = self._parse_memoized(result)
+        if self.http_cache is not None:
+            self.http_cache.put(self.cache_key(result.url), CacheEntry(
+                url=result.url,
+                text=result.text,
+                etag=get_header(result.headers, 'ETag'),
+                last_modified=get_header(result.headers, 'Last-Modified'),
+                products=products,
+                parser=self.memo_scope
+            ))
+        return products
+
+    def _run_stages(self, result: FetchResult) -> List[Product]:
+        """Decode, parse and normalize, timing each stage."""
+        if self._offload_parse():
+            with self._timed(PARSE):
+                products = self.parse_pool.parse(self, result)
+            with self._timed(NORMALIZE):
+                return self.normalize(products)
+
+        with self._timed(DECODE):
+            data = self.decode(result)
+        with self._timed(PARSE):
+            products = self.parse_products(data)
+        with self._timed(NORMALIZE):
+            return self.normalize(products)
+
+    def _parse_memoized(self, result: FetchResult) -> List[Product]:
+        """Decode, parse and normalize, reusing earlier results for identical bodies."""
+        if self.parse_memo is None:
+            return self._run_stages(result)
+
+        digest = self.parse_memo.digest(result.text)
+        products = self.parse_memo.get(self.memo_scope, digest)
+        if products is None:
+            products = self._run_stages(result)
+            self.parse_memo.put(self.memo_scope, digest, products)
+        return list(products)
+
+    def scrape_url(self, url: str) -> List[Product]:
+        """Run one URL through the whole pipeline."""
+        return self.process(self.fetch(url))
+
+    def _remaining_pages(self, result: FetchResult) -> List[str]:
+        try:
+            return self.get_page_urls(result)[:max(self.max_pages - 1, 0)]
+        except Exception as e:
+            logger.error("Error reading pagination of %s: %s", result.url, e)
+            return []
+
+    @staticmethod
+    def _waves(urls: List[str], size: int) -> Iterable[List[str]]:
+        for start in range(0, len(urls), max(size, 1)):
+            yield urls[start:start + size]
+
+    @staticmethod
+    def _add_page(products: List[Product], seen: Set[str], page: Optional[List[Product]]) -> bool:
+        """Add a page's unseen products. Returns False if a fetched page brought nothing new."""
+        if page is None:
+            return True  # Failed pages are logged and skipped, not a sign of the end
+        new = [p for p in page if p.url not in seen]
+        seen.update(p.url for p in new)
+        products.extend(new)
+        return bool(new)
+
+    def _try_scrape_url(self, url: str) -> Optional[List[Product]]:
+        try:
+            return self.scrape_url(url)
+        except Exception as e:
+            self._scrape_failed(url, e)
+            return None
+
+    def scrape_pages(self, url: str) -> List[Product]:
+        """
+        Scrape a URL and every following page.
+
+        The remaining pages are fetched concurrently in waves of
+        page_concurrency, stopping after a wave where a page brought no
+        new products.
+        """
+        first = self.fetch(url)
+        products = self.process(first)
+        seen = {p.url for p in products}
+        remaining = self._remaining_pages(first)
+        if not remaining:
+            return products
+
+        with ThreadPoolExecutor(max_workers=min(self.page_concurrency, len(remaining))) as pool:
+            for wave in self._waves(remaining, self.page_concurrency):
+                self._request_timeout()  # No new wave once the sweep deadline has passed
+                pages = list(pool.map(self._try_scrape_url, wave))
+                if not all([self._add_page(products, seen, page) for page in pages]):
+                    break
+        return products
+
     def scrape_products(self) -> List[Product]:
-        """Main scraping method - can be overridden if needed."""
+        """Main scraping method - scrapes every URL and its pages through the fetch pipeline."""
         products = []
         urls = self.get_product_urls()
-        
-        for url in urls:
+
+        with self._timed(SCRAPE):
+            for url in urls:
+                try:
+                    products.extend(self.scrape_pages(url))
+                except DeadlineExceededError as e:
+                    self._scrape_failed(url, e)
+                    break
+                except Exception as e:
+                    self._scrape_failed(url, e)
+                    continue
+
+        if self.metrics is not None:
+            self.metrics.inc(PRODUCTS, self.store_name, len(products))
+        return products
+
+    async def _async_send(self, url: str, entry: Optional[CacheEntry]) -> FetchResult:
+        """Async variant of _send."""
+        timeout = self._request_timeout()
+        bucket, breaker, probe = self._host_guards(url)
+        try:
+            if bucket is not None:
+                delay = bucket.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            start = time.monotonic()
+            response = await get_async_client().get(
+                url,
+                headers=self._request_headers(entry),
+                params=self.get_request_params(),
+                timeout=timeout,
+                trace=HTTPXTrace(self.metrics, self.store_name) if self.metrics is not None else None
+            )
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            if probe:
+                breaker.release_probe()  # Cancelled by a deadline or a winning hedge
+            raise
+        self._record_outcome(breaker, response)
+        # Time to first byte comes from the trace
+        self._record_response(response, time.monotonic() - start)
+        return self._to_result(url, response, entry)
+
+    async def async_fetch(self, url: str) -> FetchResult:
+        """Fetch a URL through the shared async client, with retries and hedging."""
+        if self._replaying():
+            return self.fixture_corpus.load(self.store_name, self.cache_key(url))
+
+        entry = self._cached_entry(url)
+        result = await self.retry_policy.async_call(
+            lambda: async_hedged(lambda: self._async_send(url, entry), self._hedge_after()),
+            deadline=self.deadline_at
+        )
+        return self._record(result)
+
+    async def async_scrape_url(self, url: str) -> List[Product]:
+        """Async variant of scrape_url."""
+        result = await self.async_fetch(url)
+        # Parse (or wait for the parse pool) off the event loop, so other fetches keep going
+        return await asyncio.to_thread(self.process, result)
+
+    async def _async_try_scrape_url(self, url: str) -> Optional[List[Product]]:
+        try:
+            return await self.async_scrape_url(url)
+        except Exception as e:
+            self._scrape_failed(url, e)
+            return None
+
+    async def async_scrape_pages(self, url: str) -> List[Product]:
+        """Async variant of scrape_pages."""
+        first = await self.async_fetch(url)
+        products = await asyncio.to_thread(self.process, first)
+        seen = {p.url for p in products}
+        for wave in self._waves(self._remaining_pages(first), self.page_concurrency):
+            self._request_timeout()  # No new wave once the sweep deadline has passed
+            pages = await asyncio.gather(*(self._async_try_scrape_url(page_url) for page_url in wave))
+            if not all([self._add_page(products, seen, page) for page in pages]):
+                break
+        return products
+
+    async def async_scrape_products(self) -> List[Product]:
+        """Async variant of scrape_products, fetching all URLs concurrently."""
+        async def scrape_url(url: str) -> List[Product]:
             try:
-                response = self.session.get(
-                    url, 
-                    headers=self.get_headers(),
-                    timeout=10
-                )
-                response.raise_for_status()
-                data = response.json()
-                products.extend(self.parse_products(data))
+                return await self.async_scrape_pages(url)
             except Exception as e:
-                logging.error(f"Error scraping {url}: {str(e)}")
-                continue
-        
+                self._scrape_failed(url, e)
+                return []
+
+        products = []
+        with self._timed(SCRAPE):
+            for url_products in await asyncio.gather(*(scrape_url(url) for url in self.get_product_urls())):
+                products.extend(url_products)
+        if self.metrics is not None:
+            self.metrics.inc(PRODUCTS, self.store_name, len(products))
         return products
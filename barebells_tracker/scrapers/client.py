@@ -0,0 +1,103 @@
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    import httpx
+
+# httpx is imported by the first AsyncHTTPClient, so sync-only runs never load it.
+# It only negotiates HTTP/2 when h2 is installed.
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+MAX_CONNECTIONS = 32           # Across all hosts
+MAX_CONNECTIONS_PER_HOST = 4
+KEEPALIVE_EXPIRY = 60.0        # Seconds an idle connection is kept open
+
+# Connection-specific headers are forbidden in HTTP/2 and handled by the client anyway
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPClient]' = weakref.WeakKeyDictionary()
+
+
+def get_session() -> requests.Session:
+    """Return the requests session shared by all scrapers in this process."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # One pool per host, capped and blocking so hosts are never flooded
+            adapter = HTTPAdapter(
+                pool_connections=MAX_CONNECTIONS,
+                pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+                pool_block=True
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+    return _session
+
+
+class AsyncHTTPClient:
+    """Pooled async HTTP client with keep-alive, HTTP/2 and a per-host connection cap."""
+
+    def __init__(self,
+                 max_connections: int = MAX_CONNECTIONS,
+                 max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST):
+        try:
+            import httpx
+        except ImportError:  # Async scraping is optional
+            raise ImportError("httpx is required for async scraping") from None
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            )
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def get(self,
+                  url: str,
+                  headers: Optional[Dict] = None,
+                  params: Optional[Dict] = None,
+                  timeout: float = 10,
+                  trace: Optional[Callable[[str, Dict], Awaitable[None]]] = None) -> 'httpx.Response':
+        """GET a URL, waiting for a free slot on its host first. trace receives httpx connection events."""
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.max_connections_per_host)
+
+        headers = {k: v for k, v in (headers or {}).items() if k.lower() not in HOP_BY_HOP_HEADERS}
+        async with limit:
+            extensions = {'trace': trace} if trace is not None else None
+            return await self._client.get(url, headers=headers, params=params, timeout=timeout, extensions=extensions)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def get_async_client() -> AsyncHTTPClient:
+    """Return the async client shared by all scrapers on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncHTTPClient()
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the shared async client of the running event loop, if any."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from .base import FetchResult
+
+CORPUS_VERSION = 1
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+
+
+class FixtureCorpus:
+    """
+    Versioned corpus of recorded responses.
+
+    Layout: <root>/v<version>/<store>/<sha1 of request key>.json, each file
+    holding the url, status, headers and body of one response. A manifest
+    per version lists what was recorded and when.
+    """
+
+    def __init__(self, root: str, version: int = CORPUS_VERSION):
+        self.root = root
+        self.version = version
+        self.directory = os.path.join(root, f"v{version}")
+        self._manifest_lock = threading.Lock()
+
+    def _path(self, store: str, key: str) -> str:
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json'
+        return os.path.join(self.directory, store, name)
+
+    def record(self, store: str, key: str, result: FetchResult) -> None:
+        """Save a response under the store and request key."""
+        path = self._path(store, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'key': key,
+                'url': result.url,
+                'status_code': result.status_code,
+                'headers': result.headers,
+                'text': result.text,
+                'recorded_at': time.time(),
+            }, f, ensure_ascii=False)
+        self._update_manifest(store, key, path)
+
+    def load(self, store: str, key: str) -> FetchResult:
+        """Return the recorded response for a request, raising KeyError if missing."""
+        path = self._path(store, key)
+        if not os.path.exists(path):
+            raise KeyError(f"No recorded response for {store} {key}")
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return FetchResult(data['url'], data['status_code'], data['text'], data['headers'])
+
+    def stores(self) -> List[str]:
+        """Stores with at least one recorded response."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory)
+                      if os.path.isdir(os.path.join(self.directory, name)))
+
+    def responses(self, store: str) -> List[FetchResult]:
+        """All recorded responses for a store."""
+        store_dir = os.path.join(self.directory, store)
+        if not os.path.isdir(store_dir):
+            return []
+        results = []
+        for name in sorted(os.listdir(store_dir)):
+            with open(os.path.join(store_dir, name), encoding='utf-8') as f:
+                data = json.load(f)
+            results.append(FetchResult(data['url'], data['status_code'], data['text'], data['headers']))
+        return results
+
+    def manifest(self) -> Dict:
+        path = os.path.join(self.directory, 'manifest.json')
+        if not os.path.exists(path):
+            return {'version': self.version, 'responses': {}}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _update_manifest(self, store: str, key: str, path: str) -> None:
+        with self._manifest_lock:
+            manifest = self.manifest()
+            manifest['responses'][os.path.relpath(path, self.directory)] = {
+                'store': store,
+                'key': key,
+                'recorded_at': time.time(),
+            }
+            with open(os.path.join(self.directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def attach_corpus(scrapers: List, corpus: Optional[FixtureCorpus], mode: str = MODE_REPLAY) -> None:
+    """Make scrapers record to or replay from a corpus; None detaches it."""
+    if mode not in (MODE_RECORD, MODE_REPLAY):
+        raise ValueError(f"Unknown fixture mode: {mode}")
+    for scraper in scrapers:
+        scraper.fixture_corpus = corpus
+        scraper.fixture_mode = mode
@@ -1,11 +1,18 @@
 import re
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from ..models.product import Product 
-from .base import BaseScraper
+from .base import BaseScraper, FetchResult, with_query_params
+
+logger = logging.getLogger(__name__)
 
 
 class HemkopScraper(BaseScraper):
+    def __init__(self, store_id: Optional[str] = None):
+        super().__init__()
+        # Store to price products for; None uses the site's default store
+        self.location = store_id
+
     def get_headers(self) -> Dict:
         return {
             'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0',
@@ -22,7 +29,16 @@ class HemkopScraper(BaseScraper):
         }
 
     def get_product_urls(self) -> List[str]:
-        return ['https://www.hemkop.se/search/multisearchComplete?q=barebells&page=0&size=30&show=Page&sort=relevance']
+        url = 'https://www.hemkop.se/search/multisearchComplete?q=barebells&page=0&size=30&show=Page&sort=relevance'
+        if self.location is not None:
+            url = with_query_params(url, storeId=self.location)
+        return [url]
+
+    def get_page_urls(self, result: FetchResult) -> List[str]:
+        # Pages are numbered from 0; the first response says how many there are
+        pagination = self.decode(result).get('productSearchPageData', {}).get('pagination', {})
+        number_of_pages = int(pagination.get('numberOfPages') or 1)
+        return [with_query_params(result.url, page=page) for page in range(1, number_of_pages)]
 
     def parse_products(self, data: Dict) -> List[Product]:
         products = []
@@ -70,17 +86,18 @@ class HemkopScraper(BaseScraper):
                     store='hemkop',
                     package_size=package_size,
                     per_unit_price=price / package_size if package_size else None,
-                    available=available
+                    available=available,
+                    location=self.location
                 )
                 
                 products.append(product)
                 if promo_price:
-                    logging.info(f"Found product: {name} at {price} SEK (promotional price, regular: {base_price} SEK)")
+                    logger.debug("Found product: %s at %s SEK (promotional price, regular: %s SEK)", name, price, base_price)
                 else:
-                    logging.info(f"Found product: {name} at {price} SEK")
+                    logger.debug("Found product: %s at %s SEK", name, price)
                 
             except Exception as e:
-                logging.error(f"Error processing product {name if 'name' in locals() else 'unknown'}: {str(e)}")
+                logger.error("Error processing product %s: %s", name if 'name' in locals() else 'unknown', e)
                 continue
                 
         return products
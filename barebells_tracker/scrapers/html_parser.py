@@ -0,0 +1,114 @@
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:  # Fall back to BeautifulSoup
+    LXML_AVAILABLE = False
+
+BACKEND_LXML = 'lxml'
+BACKEND_BS4 = 'bs4'
+
+_backend = BACKEND_LXML if LXML_AVAILABLE else BACKEND_BS4
+
+
+def get_backend() -> str:
+    """Return the parser back-end used by select()."""
+    return _backend
+
+
+def set_backend(backend: str) -> None:
+    """Switch the parser back-end used by select()."""
+    global _backend
+    if backend not in (BACKEND_LXML, BACKEND_BS4):
+        raise ValueError(f"Unknown parser backend: {backend}")
+    if backend == BACKEND_LXML and not LXML_AVAILABLE:
+        raise ImportError("lxml is not installed")
+    _backend = backend
+
+
+@lru_cache(maxsize=None)
+def _xpath(tag: str, class_: Optional[str], href: bool):
+    """Compiled XPath matching descendants the way bs4's find_all(tag, class_=..., href=True) does."""
+    expr = f'.//{tag}'
+    if class_:
+        expr += f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_} ')]"
+    if href:
+        expr += '[@href]'
+    return etree.XPath(expr)
+
+
+class LxmlNode:
+    """Wraps an lxml element with the subset of the bs4 Tag API the parsers use."""
+    __slots__ = ('_element',)
+
+    def __init__(self, element):
+        self._element = element
+
+    @property
+    def text(self) -> str:
+        return self._element.text_content()
+
+    def get_text(self) -> str:
+        return self._element.text_content()
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return dict(self._element.attrib)
+
+    def get(self, key: str, default=None):
+        return self._element.get(key, default)
+
+    def __getitem__(self, key: str) -> str:
+        return self._element.attrib[key]
+
+    def find_all(self, tag: str, class_: Optional[str] = None, href: bool = False) -> List['LxmlNode']:
+        return [LxmlNode(el) for el in _xpath(tag, class_, href)(self._element)]
+
+    def find(self, tag: str, class_: Optional[str] = None, href: bool = False) -> Optional['LxmlNode']:
+        matches = _xpath(tag, class_, href)(self._element)
+        return LxmlNode(matches[0]) if matches else None
+
+
+def _select_lxml(html: str, tag: str, class_: Optional[str]) -> List[LxmlNode]:
+    # Encode so documents with an XML encoding declaration are accepted
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    # document_fromstring so a fragment's top element is a descendant of the root too
+    root = lxml.html.document_fromstring(html.encode('utf-8'), parser=parser)
+    return [LxmlNode(el) for el in _xpath(tag, class_, False)(root)]
+
+
+def _select_bs4(html: str, tag: str, class_: Optional[str]):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    def has_class(value) -> bool:
+        # While straining, class is still the raw attribute string
+        classes = value.split() if isinstance(value, str) else (value or [])
+        return class_ in classes
+
+    # Only build the tree for the containers, not the whole page
+    strainer = SoupStrainer(tag, attrs={'class': has_class}) if class_ else SoupStrainer(tag)
+    soup = BeautifulSoup(html, 'lxml' if LXML_AVAILABLE else 'html.parser', parse_only=strainer)
+    return soup.find_all(tag, class_=class_) if class_ else soup.find_all(tag)
+
+
+def select(html: str, tag: str, class_: Optional[str] = None, backend: Optional[str] = None) -> List:
+    """
+    Return the product container elements of a page.
+
+    The returned nodes support find/find_all/get/text/get_text/attrs like
+    bs4 Tags, whichever back-end parsed them.
+
+    Args:
+        html: Page or HTML fragment
+        tag: Container tag name, e.g. 'div'
+        class_: CSS class the container must have
+        backend: 'lxml' or 'bs4'; defaults to get_backend()
+    """
+    if not html or not html.strip():
+        return []
+    if (backend or _backend) == BACKEND_LXML:
+        return _select_lxml(html, tag, class_)
+    return _select_bs4(html, tag, class_)
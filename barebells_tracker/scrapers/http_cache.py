@@ -0,0 +1,132 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from ..models.product import Product
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'http')
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def get_header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup on a plain dict."""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+@dataclass
+class CacheEntry:
+    """Validators, body and parsed products of one cached response."""
+    url: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    products: List[Product] = field(default_factory=list)
+    parser: Optional[str] = None  # Memo scope of the scraper that parsed products
+
+    def validators(self) -> Dict[str, str]:
+        """Headers that make the next request conditional."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    On-disk cache for conditional requests.
+
+    Entries are pickled one file per URL. When the directory grows past
+    max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.pickle')
+
+    def _entries(self):
+        """Yield (path, mtime, size) for every entry file."""
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pickle'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            yield path, stat.st_mtime, stat.st_size
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry for a key, marking it as recently used."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error("Dropping unreadable cache entry for %s: %s", key, e)
+            self._remove(path)
+            return None
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting old ones if the cache is over its size limit."""
+        if not entry.etag and not entry.last_modified:
+            return  # Nothing to revalidate with
+
+        path = self._path(key)
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+
+        with self._lock:
+            try:
+                self._total_bytes -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._total_bytes -= size
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        for path, _, _ in sorted(self._entries(), key=lambda entry: entry[1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                self._remove(path)
+            self._total_bytes = 0
@@ -1,14 +1,19 @@
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 import json
 from ..models.product import Product
-from .base import BaseScraper
+from .base import BaseScraper, FetchResult, with_query_params
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_ID = "1088004"
 
 class ICAScraper(BaseScraper):
-    def __init__(self):
+    def __init__(self, store_id: Optional[str] = None):
         super().__init__()
-        # ICA store ID - could be made configurable
-        self.store_id = "1088004"
+        # ICA store ID; prices and promos are per store
+        self.store_id = store_id or DEFAULT_STORE_ID
+        self.location = store_id
     
     def get_headers(self) -> Dict:
         return {
@@ -32,6 +37,17 @@ class ICAScraper(BaseScraper):
     def get_product_urls(self) -> List[str]:
         return [f'https://handlaprivatkund.ica.se/stores/{self.store_id}/api/v5/products/search?offset=0&term=barebells']
 
+    def get_page_urls(self, result: FetchResult) -> List[str]:
+        data = self.decode(result)
+        page_size = len(data.get('entities', {}).get('product', {}))
+        # Total hit count; where it lives in the search response varies, so try the known spots
+        total = (data.get('totalCount')
+                 or data.get('result', {}).get('totalCount')
+                 or data.get('metadata', {}).get('totalCount'))
+        if not page_size or not total:
+            return []
+        return [with_query_params(result.url, offset=offset) for offset in range(page_size, int(total), page_size)]
+
     def parse_products(self, data: Dict) -> List[Product]:
         products = []
         
@@ -91,14 +107,15 @@ class ICAScraper(BaseScraper):
                     url=url,
                     store='ica',
                     package_size=package_size,
-                    available=available
+                    available=available,
+                    location=self.location
                 )
                 
                 products.append(product)
-                logging.info(f"Found product: {name} at {price} SEK")
+                logger.debug("Found product: %s at %s SEK", name, price)
                 
             except Exception as e:
-                logging.error(f"Error processing product {name if 'name' in locals() else 'unknown'}: {str(e)}")
+                logger.error("Error processing product %s: %s", name if 'name' in locals() else 'unknown', e)
                 continue
                 
         return products
@@ -2,11 +2,15 @@ import re
 import logging
 from typing import Dict, List
 from ..models.product import Product 
-from .base import BaseScraper
-from bs4 import BeautifulSoup
+from .base import BaseScraper, ResponseType
+from .html_parser import select
+
+logger = logging.getLogger(__name__)
 
 
 class MedsScraper(BaseScraper):
+    response_type = ResponseType.HTML
+
     def get_headers(self) -> Dict:
         return {
             'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0',
@@ -23,10 +27,8 @@ class MedsScraper(BaseScraper):
 
     def parse_products(self, html_content: str) -> List[Product]:
         products = []
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
         # Find all product cards
-        product_cards = soup.find_all('div', class_='product-card-grid')
+        product_cards = select(html_content, 'div', 'product-card-grid')
         
         for card in product_cards:
             try:
@@ -76,30 +78,10 @@ class MedsScraper(BaseScraper):
                 )
                 
                 products.append(product)
-                logging.info(f"Found product: {name} at {price} SEK")
+                logger.debug("Found product: %s at %s SEK", name, price)
                 
             except Exception as e:
-                logging.error(f"Error processing product {name if 'name' in locals() else 'unknown'}: {str(e)}")
+                logger.error("Error processing product %s: %s", name if 'name' in locals() else 'unknown', e)
                 continue
                 
         return products
-
-    def scrape_products(self) -> List[Product]:
-        """Override scrape_products to handle HTML response."""
-        products = []
-        urls = self.get_product_urls()
-        
-        for url in urls:
-            try:
-                response = self.session.get(
-                    url, 
-                    headers=self.get_headers(),
-                    timeout=10
-                )
-                response.raise_for_status()
-                products.extend(self.parse_products(response.text))
-            except Exception as e:
-                logging.error(f"Error scraping {url}: {str(e)}")
-                continue
-        
-        return products
@@ -0,0 +1,119 @@
+import hashlib
+import shelve
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from ..models.product import Product
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_PERSISTED = 4096
+# Bump when the pickled Product layout changes, so older persisted entries are dropped
+MEMO_FORMAT = 1
+_INDEX_KEY = '__lru__'  # Persisted keys, least recently used first, saved on close
+
+
+class ParseMemo:
+    """
+    Content-addressed cache of parsed products.
+
+    Keyed by (store, digest of the response body), so a byte-identical body
+    skips decoding and parsing entirely. Callers put their parser version
+    in the store scope, so results of older parsing code are never returned.
+    Holds an in-memory LRU and, if a persist_path is given, a shelve file
+    that survives restarts, itself capped at max_persisted entries.
+    """
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 persist_path: Optional[str] = None,
+                 max_persisted: int = DEFAULT_MAX_PERSISTED):
+        self.max_entries = max_entries
+        self.max_persisted = max_persisted
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, List[Product]]' = OrderedDict()
+        self._persisted: 'OrderedDict[str, None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._shelf = shelve.open(persist_path) if persist_path else None
+        if self._shelf is not None:
+            self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuild the persisted LRU order, dropping entries of other formats."""
+        order = self._shelf.get(_INDEX_KEY, [])
+        keys = set(self._shelf.keys()) - {_INDEX_KEY}
+        # Entries written after the index was last saved, e.g. before a crash, count as oldest
+        for key in keys.difference(order):
+            self._persisted[key] = None
+        for key in order:
+            if key in keys:
+                self._persisted[key] = None
+        prefix = f"{MEMO_FORMAT}:"
+        for key in [key for key in self._persisted if not key.startswith(prefix)]:
+            del self._persisted[key]
+            del self._shelf[key]
+        self._evict_persisted()
+
+    def _evict_persisted(self) -> None:
+        while len(self._persisted) > self.max_persisted:
+            key, _ = self._persisted.popitem(last=False)
+            del self._shelf[key]
+
+    @staticmethod
+    def _key(store: str, digest: str) -> str:
+        return f"{MEMO_FORMAT}:{store}:{digest}"
+
+    @staticmethod
+    def digest(body: str) -> str:
+        """Digest of a response body."""
+        return hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, store: str, digest: str) -> Optional[List[Product]]:
+        """Return the products parsed from this body before, or None."""
+        key = self._key(store, digest)
+        with self._lock:
+            products = self._entries.get(key)
+            if products is not None:
+                self._entries.move_to_end(key)
+                if key in self._persisted:
+                    self._persisted.move_to_end(key)
+            elif self._shelf is not None and key in self._persisted:
+                products = self._shelf[key]
+                self._persisted.move_to_end(key)
+                self._remember(key, products)
+
+            if products is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return products
+
+    def put(self, store: str, digest: str, products: List[Product]) -> None:
+        """Remember the products parsed from a body."""
+        key = self._key(store, digest)
+        with self._lock:
+            self._remember(key, products)
+            if self._shelf is not None:
+                self._shelf[key] = products
+                self._persisted[key] = None
+                self._persisted.move_to_end(key)
+                self._evict_persisted()
+
+    def _remember(self, key: str, products: List[Product]) -> None:
+        self._entries[key] = products
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current in-memory and persisted sizes."""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                'persisted': len(self._persisted)}
+
+    def close(self) -> None:
+        """Save the LRU order, then flush and close the persistent tier."""
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf[_INDEX_KEY] = list(self._persisted)
+                self._shelf.close()
+                self._shelf = None
@@ -0,0 +1,96 @@
+import importlib
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from ..models.product import Product
+
+if TYPE_CHECKING:
+    from .base import BaseScraper, FetchResult
+
+WARM_UP_HOLD = 0.2  # Seconds
+MAX_WORKER_SCRAPERS = 64  # Rebuilt scrapers kept per worker, e.g. one per store location
+
+# Modules imported once per worker when it starts, so the first parse doesn't pay for them
+WARM_MODULES = (
+    'barebells_tracker.scrapers.html_parser',
+    'bs4',
+    'lxml.html',
+)
+
+# Scrapers rebuilt in this worker process, by class and state, least recently used first
+_worker_scrapers: 'OrderedDict[Tuple[str, str, str], BaseScraper]' = OrderedDict()
+
+
+def _warm() -> None:
+    for module in WARM_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass  # Optional parser back-ends
+
+
+def _ready(hold: float) -> int:
+    # Stay busy for a moment so the pool starts a new worker for every warm-up task
+    time.sleep(hold)
+    return os.getpid()
+
+
+def _worker_scraper(module: str, qualname: str, state: Dict) -> 'BaseScraper':
+    """The scraper for a class and state, built once per worker without running __init__."""
+    key = (module, qualname, repr(sorted(state.items())))
+    scraper = _worker_scrapers.get(key)
+    if scraper is not None:
+        _worker_scrapers.move_to_end(key)
+        return scraper
+
+    cls = getattr(importlib.import_module(module), qualname)
+    scraper = cls.__new__(cls)
+    vars(scraper).update(state)
+    _worker_scrapers[key] = scraper
+    if len(_worker_scrapers) > MAX_WORKER_SCRAPERS:
+        _worker_scrapers.popitem(last=False)
+    return scraper
+
+
+def _parse(module: str, qualname: str, state: Dict, result: 'FetchResult') -> List[tuple]:
+    """Decode and parse one response in a worker, returning compact product rows."""
+    scraper = _worker_scraper(module, qualname, state)
+    return [p.to_row() for p in scraper.parse_products(scraper.decode(result))]
+
+
+class ParsePool:
+    """
+    Process pool parsing response bodies outside the GIL.
+
+    Scrapers are sent as class path plus instance state and rebuilt once
+    per worker; bodies go in and Product rows come back, so only plain
+    strings and tuples are pickled. Workers import the parser back-ends
+    when they start and are all started up front.
+    """
+
+    def __init__(self, workers: Optional[int] = None, start_method: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        if start_method is None:
+            # Forking a process with running threads is unsafe; forkserver avoids it where available
+            methods = multiprocessing.get_all_start_methods()
+            start_method = 'forkserver' if 'forkserver' in methods else 'spawn'
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_warm
+        )
+        warm_up = [self._executor.submit(_ready, WARM_UP_HOLD) for _ in range(self.workers)]
+        self.pids = set(future.result() for future in wait(warm_up).done)
+
+    def parse(self, scraper: 'BaseScraper', result: 'FetchResult') -> List[Product]:
+        """Decode and parse a response in a worker (blocks the calling thread only)."""
+        cls = type(scraper)
+        body = type(result)(result.url, result.status_code, result.text)  # Headers aren't needed to parse
+        rows = self._executor.submit(_parse, cls.__module__, cls.__qualname__, scraper.parse_state(), body).result()
+        return Product.from_rows(rows)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,210 @@
+import asyncio
+import random
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from .client import MAX_CONNECTIONS
+from .throttle import CircuitOpenError
+
+T = TypeVar('T')
+
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+MIN_SAMPLES = 20  # Latencies needed before a store's quantiles are trusted
+
+# Histogram bucket upper bounds: 10 ms to about a minute, 25% apart
+LATENCY_BUCKETS = tuple(0.01 * 1.25 ** i for i in range(40))
+
+
+class DeadlineExceededError(TimeoutError):
+    """The sweep a request belongs to has run out of time; never retried."""
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution of one store, cheap to update and query."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last bucket is overflow
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, q: float, min_samples: int = MIN_SAMPLES) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile, or None with too few samples."""
+        with self._lock:
+            if self.count < min_samples:
+                return None
+            target = q * self.count
+            cumulative = 0
+            for i, count in enumerate(self.counts):
+                cumulative += count
+                if cumulative >= target:
+                    return self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+            return self.buckets[-1]
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_latency_histogram(store: str) -> LatencyHistogram:
+    """Latency histogram of a store, shared by all its scrapers."""
+    with _histograms_lock:
+        if store not in _histograms:
+            _histograms[store] = LatencyHistogram()
+        return _histograms[store]
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Status code of an HTTP error from requests or httpx, if it has one."""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retries for idempotent GETs with jittered exponential back-off.
+
+    Connection errors, timeouts and the statuses in retry_statuses are
+    retried; other HTTP errors and open circuits are not.
+    """
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    retry_statuses: Tuple[int, ...] = RETRY_STATUSES
+
+    def should_retry(self, error: Exception) -> bool:
+        if isinstance(error, (CircuitOpenError, DeadlineExceededError)):
+            return False
+        status = _status_code(error)
+        return status is None or status in self.retry_statuses
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter back-off before retry number attempt + 1."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _backoff(self, attempt: int, deadline: Optional[float]) -> Optional[float]:
+        """Delay before the next attempt, or None if it would end past the deadline (monotonic)."""
+        delay = self.delay(attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def call(self, fn: Callable[[], T], deadline: Optional[float] = None) -> T:
+        """Call fn until it succeeds, attempts run out, or the next retry would end past deadline."""
+        for attempt in range(self.attempts):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt + 1 >= self.attempts or not self.should_retry(e):
+                    raise
+                delay = self._backoff(attempt, deadline)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+        raise RuntimeError("RetryPolicy needs at least one attempt")
+
+    async def async_call(self, fn: Callable[[], Awaitable[T]], deadline: Optional[float] = None) -> T:
+        for attempt in range(self.attempts):
+            try:
+                return await fn()
+            except Exception as e:
+                if attempt + 1 >= self.attempts or not self.should_retry(e):
+                    raise
+                delay = self._backoff(attempt, deadline)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+        raise RuntimeError("RetryPolicy needs at least one attempt")
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=MAX_CONNECTIONS, thread_name_prefix='hedge')
+        return _hedge_executor
+
+
+def _first_successful(futures: List[Future]) -> T:
+    """Result of the first future to succeed; raises the first error if all fail."""
+    pending = set(futures)
+    errors: List[Exception] = []
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+            errors.append(future.exception())
+    raise errors[0]
+
+
+def hedged(fn: Callable[[], T], hedge_after: Optional[float]) -> T:
+    """
+    Call fn, and call it a second time if the first call is still running
+    after hedge_after seconds. Returns whichever succeeds first.
+    """
+    if hedge_after is None:
+        return fn()
+    executor = _get_hedge_executor()
+    primary = executor.submit(fn)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+    return _first_successful([primary, executor.submit(fn)])
+
+
+async def _cancel_pending(tasks: List['asyncio.Task']) -> None:
+    """Cancel the tasks that are still running and wait until they have stopped."""
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def async_hedged(fn: Callable[[], Awaitable[T]], hedge_after: Optional[float]) -> T:
+    """
+    Async variant of hedged; the slower request is cancelled.
+
+    Both requests are also cancelled if the caller is, e.g. by a sweep
+    deadline, so none outlive it.
+    """
+    if hedge_after is None:
+        return await fn()
+    tasks = [asyncio.ensure_future(fn())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done:
+            return tasks[0].result()
+
+        tasks.append(asyncio.ensure_future(fn()))
+        pending = set(tasks)
+        errors: List[BaseException] = []
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                errors.append(task.exception())
+        raise errors[0]
+    finally:
+        await _cancel_pending(tasks)
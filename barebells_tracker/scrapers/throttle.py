@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+DEFAULT_RATE = 2.0             # Requests per second per host
+DEFAULT_BURST = 4              # Requests allowed back to back before the rate applies
+DEFAULT_FAILURE_THRESHOLD = 5  # Consecutive failures that open the circuit
+DEFAULT_RESET_TIMEOUT = 30.0   # Seconds the circuit stays open before a probe
+DEFAULT_MAX_RESET_TIMEOUT = 600.0
+DEFAULT_PROBE_TIMEOUT = 60.0   # Seconds after which a probe that never reported back is written off
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host that keeps failing."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, next attempt in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `burst`.
+
+    reserve() takes a token and returns how long the caller must wait for
+    it, so the same bucket serves threads (time.sleep) and coroutines
+    (asyncio.sleep) without blocking under the lock.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds until it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one host.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast with CircuitOpenError. Once the reset timeout has
+    passed, a single probe request is let through (half-open): success
+    closes the circuit, failure opens it again with the timeout doubled,
+    up to max_reset_timeout. A probe abandoned without an outcome (e.g.
+    cancelled) must call release_probe(); one that never reports back at
+    all is written off after probe_timeout.
+    """
+
+    def __init__(self,
+                 host: str,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                 max_reset_timeout: float = DEFAULT_MAX_RESET_TIMEOUT,
+                 probe_timeout: float = DEFAULT_PROBE_TIMEOUT):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.probe_timeout = probe_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._current_timeout = reset_timeout
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """
+        Raise CircuitOpenError unless a request may be sent now.
+
+        Returns True if the caller is the half-open probe.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                probe_left = self._probe_started + self.probe_timeout - now
+                if probe_left > 0:
+                    raise CircuitOpenError(self.host, probe_left)
+                self.state = OPEN  # The probe was lost; this caller takes over
+            retry_in = self._opened_at + self._current_timeout - now
+            if self.state == OPEN and retry_in <= 0:
+                self.state = HALF_OPEN
+                self._probe_started = now
+                return True
+            raise CircuitOpenError(self.host, max(retry_in, 0.0))
+
+    def release_probe(self) -> None:
+        """Give up the probe without an outcome; the next request probes instead."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._current_timeout = self.reset_timeout
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self._current_timeout = min(self._current_timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_host_guards(host: str,
+                    rate: Optional[float] = DEFAULT_RATE,
+                    burst: int = DEFAULT_BURST,
+                    failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                    reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                    max_reset_timeout: float = DEFAULT_MAX_RESET_TIMEOUT) -> Tuple[Optional[TokenBucket], CircuitBreaker]:
+    """
+    Rate limiter and circuit breaker shared by everything requesting from a host.
+
+    The settings of the first caller for a host apply; a rate of None
+    disables rate limiting for the host.
+    """
+    with _registry_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host, failure_threshold, reset_timeout, max_reset_timeout)
+            if rate:
+                _buckets[host] = TokenBucket(rate, burst)
+        return _buckets.get(host), _breakers[host]
+
+
+def reset_host_guards() -> None:
+    """Forget all rate limiters and circuit breakers."""
+    with _registry_lock:
+        _buckets.clear()
+        _breakers.clear()
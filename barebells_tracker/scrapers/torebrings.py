@@ -2,10 +2,14 @@ import re
 import logging
 from typing import Dict, List
 from ..models.product import Product 
-from .base import BaseScraper
-from bs4 import BeautifulSoup
+from .base import BaseScraper, ResponseType
+from .html_parser import select
+
+logger = logging.getLogger(__name__)
 
 class TorebringsScraper(BaseScraper):
+    response_type = ResponseType.HTML
+
     def get_headers(self) -> Dict:
         return {
             'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0',
@@ -30,7 +34,7 @@ class TorebringsScraper(BaseScraper):
         try:
             return float(price_text)*1.12
         except ValueError:
-            logging.error(f"Could not parse price from: {price_text}")
+            logger.error("Could not parse price from: %s", price_text)
             return 0.0
         
     def extract_package_info(self, text: str) -> tuple:
@@ -55,10 +59,8 @@ class TorebringsScraper(BaseScraper):
 
     def parse_products(self, html_content: str) -> List[Product]:
         products = []
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
         # Find all pricing tables
-        product_tables = soup.find_all('div', class_='pricing-table')
+        product_tables = select(html_content, 'div', 'pricing-table')
         
         for table in product_tables:
             try:
@@ -79,13 +81,13 @@ class TorebringsScraper(BaseScraper):
                 # Get price information from the description div
                 description = table.find('div', class_='description')
                 if not description:
-                    logging.error(f"No description div found for {name}")
+                    logger.error("No description div found for %s", name)
                     continue
                 
                 # Find the campaignPrices span first
                 campaign_span = description.find('span', class_='campaignPrices')
                 if not campaign_span:
-                    logging.error(f"No campaignPrices span found for {name}")
+                    logger.error("No campaignPrices span found for %s", name)
                     continue
                 
                 # Look for spans containing text that starts with a digit
@@ -109,15 +111,15 @@ class TorebringsScraper(BaseScraper):
                             price_part = price_text.split('pris:')[1].split('kr')[0].strip()
                             price = float(price_part.replace(',', '.')) * 1.12
                     except Exception as e:
-                        logging.error(f"Error extracting price from text: {price_text if 'price_text' in locals() else 'unknown'}")
-                        logging.error(str(e))
+                        logger.error("Error extracting price from text: %s", price_text if 'price_text' in locals() else 'unknown')
+                        logger.error("%s", e)
                 
                 if not price:
-                    logging.error(f"Could not find price for product {name}")
+                    logger.error("Could not find price for product %s", name)
                     continue
 
                 # Debug log the found price
-                logging.debug(f"Found price for {name}: {price} SEK")
+                logger.debug("Found price for %s: %s SEK", name, price)
                 
                 # Get stock information
                 stock_div = table.find('div', class_='lager')
@@ -153,30 +155,10 @@ class TorebringsScraper(BaseScraper):
                 )
                 
                 products.append(product)
-                logging.info(f"Found product: {name} (12-pack) at {price} SEK")
+                logger.debug("Found product: %s (12-pack) at %s SEK", name, price)
                 
             except Exception as e:
-                logging.error(f"Error processing product {name if 'name' in locals() else 'unknown'}: {str(e)}")
+                logger.error("Error processing product %s: %s", name if 'name' in locals() else 'unknown', e)
                 continue
                 
         return products
-
-    def scrape_products(self) -> List[Product]:
-        """Override scrape_products to handle HTML response."""
-        products = []
-        urls = self.get_product_urls()
-        
-        for url in urls:
-            try:
-                response = self.session.get(
-                    url, 
-                    headers=self.get_headers(),
-                    timeout=10
-                )
-                response.raise_for_status()
-                products.extend(self.parse_products(response.text))
-            except Exception as e:
-                logging.error(f"Error scraping {url}: {str(e)}")
-                continue
-        
-        return products
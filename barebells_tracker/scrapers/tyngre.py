@@ -4,6 +4,8 @@ from typing import Dict, List
 from ..models.product import Product
 from .base import BaseScraper
 
+logger = logging.getLogger(__name__)
+
 class TyngreScraper(BaseScraper):
     def get_headers(self) -> Dict:
         return {
@@ -63,10 +65,10 @@ class TyngreScraper(BaseScraper):
                             available=available
                         )
                         products.append(product)
-                        logging.info(f"Found product: {name} at {price} SEK")
+                        logger.debug("Found product: %s at %s SEK", name, price)
                         
                     except Exception as e:
-                        logging.error(f"Error processing product {name if 'name' in locals() else 'unknown'}: {str(e)}")
+                        logger.error("Error processing product %s: %s", name if 'name' in locals() else 'unknown', e)
                         continue
         
         return products
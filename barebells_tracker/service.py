@@ -0,0 +1,301 @@
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from .catalog import ProductCatalog
+from .models.product import Product
+from .utils.filtering import ExclusionMatcher
+
+if TYPE_CHECKING:
+    from .tracker import BarebellsTracker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_REFRESH_INTERVAL = 15 * 60    # Seconds between background sweeps
+DEFAULT_SWEEP = {'concurrent': True, 'deadline': 30}
+MAX_CACHED_RESPONSES = 1024           # Distinct queries cached per sweep generation
+MAX_LIMIT = 100
+
+# Queries answered ahead of time for every new generation
+PRECOMPUTED_QUERIES = [
+    ('/products', ()),
+    ('/store-summary', ()),
+    ('/best-deals', ()),
+    ('/best-deals', (('package_size', '12'),)),
+    ('/price-range', ()),
+    ('/price-range', (('package_size', '12'),)),
+]
+
+PRODUCT_FIELDS = ('name', 'price', 'url', 'store', 'per_unit_price',
+                  'package_size', 'stock', 'available', 'location')
+
+Query = Tuple[Tuple[str, str], ...]
+
+
+class QueryError(ValueError):
+    """Bad query parameter, answered with 400."""
+
+
+def product_json(product: Product) -> Dict:
+    return dict(zip(PRODUCT_FIELDS, product.to_row()))
+
+
+def _int(params: Dict[str, str], name: str) -> Optional[int]:
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer") from None
+
+
+def _float(params: Dict[str, str], name: str) -> Optional[float]:
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise QueryError(f"{name} must be a number") from None
+
+
+def _bool(params: Dict[str, str], name: str, default: bool) -> bool:
+    value = params.get(name)
+    if value is None or value == '':
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+
+class Generation:
+    """
+    One sweep's read-only query state and its response cache.
+
+    Holds the sweep's catalog and exclusions, so queries never touch the
+    tracker while the next sweep is running. Encoded responses are cached
+    per query for as long as the generation is current.
+    """
+
+    def __init__(self, number: int, catalog: ProductCatalog, exclusions: ExclusionMatcher,
+                 epoch: str = '', stale_stores: Tuple[str, ...] = ()):
+        self.number = number
+        self.swept_at = time.time()
+        self.catalog = catalog
+        self.exclusions = exclusions
+        self.stale_stores = stale_stores  # Stores carried over from the previous generation
+        # Generation numbers restart with the process, so the epoch keeps ETags unique
+        self.etag = f'"{epoch}-{number}"'
+        self._responses: Dict[Tuple[str, Query], bytes] = {}
+        self._lock = threading.Lock()
+
+    def response(self, path: str, query: Query) -> bytes:
+        """Encoded JSON response for a query, computed on first use."""
+        key = (path, query)
+        body = self._responses.get(key)
+        if body is None:
+            result = ENDPOINTS[path](self, dict(query))
+            body = json.dumps({
+                'generation': self.number,
+                'swept_at': self.swept_at,
+                'result': result
+            }).encode()
+            with self._lock:
+                if len(self._responses) < MAX_CACHED_RESPONSES:
+                    self._responses[key] = body
+        return body
+
+    def products(self, params: Dict[str, str]) -> List[Dict]:
+        products = self.catalog.get_products(
+            store=params.get('store') or None,
+            package_size=_int(params, 'package_size'),
+            min_price=_float(params, 'min_price'),
+            max_price=_float(params, 'max_price'),
+            only_available=_bool(params, 'only_available', True),
+            min_stock=_int(params, 'min_stock'),
+            sort_by=params.get('sort_by') or None,
+            reverse_sort=_bool(params, 'reverse', False),
+            exclusions=self.exclusions
+        )
+        return [product_json(p) for p in products]
+
+    def best_deals(self, params: Dict[str, str]) -> List[Dict]:
+        limit = _int(params, 'limit')
+        if limit is None:
+            limit = 5
+        if not 0 < limit <= MAX_LIMIT:
+            raise QueryError(f"limit must be between 1 and {MAX_LIMIT}")
+        deals = self.catalog.get_best_deals(_int(params, 'package_size'), limit, self.exclusions)
+        return [product_json(p) for p in deals]
+
+    def price_range(self, params: Dict[str, str]) -> Dict[str, Optional[float]]:
+        return self.catalog.get_price_range(_int(params, 'package_size'), self.exclusions)
+
+    def store_summary(self, params: Dict[str, str]) -> Dict[str, int]:
+        return self.catalog.get_store_summary()
+
+
+ENDPOINTS: Dict[str, Callable[[Generation, Dict[str, str]], object]] = {
+    '/products': Generation.products,
+    '/best-deals': Generation.best_deals,
+    '/price-range': Generation.price_range,
+    '/store-summary': Generation.store_summary,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: 'QueryService'
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/') or '/'
+        if path == '/status':
+            self._send(200, json.dumps(self.service.status()).encode())
+            return
+
+        generation = self.service.generation
+        if generation is None:
+            self._send(503, b'{"error": "first sweep still running"}', {'Retry-After': '5'})
+            return
+        if path not in ENDPOINTS:
+            self._send(404, json.dumps({'error': f"unknown endpoint {path}"}).encode())
+            return
+        if self.headers.get('If-None-Match') == generation.etag:
+            self._send(304, b'', {'ETag': generation.etag})
+            return
+
+        # Parameter order doesn't matter, so equivalent queries share a cache entry
+        query = tuple(sorted(parse_qsl(url.query)))
+        try:
+            body = generation.response(path, query)
+        except QueryError as e:
+            self._send(400, json.dumps({'error': str(e)}).encode())
+            return
+        self._send(200, body, {'ETag': generation.etag})
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+
+class QueryService:
+    """
+    Resident tracker serving the latest sweep over a local HTTP/JSON API.
+
+    A background thread sweeps every refresh_interval seconds. Each
+    finished sweep becomes a new generation whose common responses are
+    encoded up front; other queries are encoded once and then served
+    from memory until the next generation replaces it.
+
+    Endpoints: /products, /best-deals, /price-range and /store-summary,
+    taking the matching tracker method's arguments as query parameters,
+    plus /status.
+    """
+
+    def __init__(self,
+                 tracker: 'BarebellsTracker',
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 sweep: Optional[Dict] = None):
+        self.tracker = tracker
+        self.refresh_interval = refresh_interval
+        self.sweep = dict(DEFAULT_SWEEP if sweep is None else sweep)
+        self.generation: Optional[Generation] = None
+        self.last_error: Optional[str] = None
+        self._generations = 0
+        self._epoch = f'{time.time_ns():x}'
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+        handler = type('Handler', (_Handler,), {'service': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.server.server_address[:2]
+
+    def refresh(self) -> Generation:
+        """
+        Sweep now and make the result the current generation.
+
+        Stores that returned nothing most likely failed, so their products
+        from the previous generation are served until they sweep again.
+        """
+        with self._refresh_lock:
+            products = self.tracker.run(**self.sweep)
+            catalog = self.tracker.catalog
+            stale: Tuple[str, ...] = ()
+            previous = self.generation
+            if previous is not None:
+                swept_stores = {p.store for p in products}
+                carried = [p for p in previous.catalog.products if p.store not in swept_stores]
+                if carried:
+                    catalog = ProductCatalog(products + carried)
+                    stale = tuple(sorted({p.store for p in carried}))
+                    logger.warning("No products from %s; serving their previous products", ', '.join(stale))
+            self._generations += 1
+            generation = Generation(self._generations, catalog, self.tracker.exclusion_matcher,
+                                    self._epoch, stale)
+            for path, query in PRECOMPUTED_QUERIES:
+                generation.response(path, query)
+            self.generation = generation
+        logger.info("Serving generation %s with %s products", generation.number, generation.catalog.size)
+        return generation
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error("Error refreshing products: %s", e)
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    def start(self) -> None:
+        """Start background refreshing, serving queries as soon as the first sweep is in."""
+        self._stop.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, name='refresh', daemon=True)
+        self._refresher.start()
+
+    def serve_forever(self) -> None:
+        """Start refreshing and serve until shutdown() is called."""
+        if self._refresher is None:
+            self.start()
+        logger.info("Serving on http://%s:%s", *self.address)
+        self.server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving and refreshing; a sweep in progress is left to finish."""
+        self._stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def status(self) -> Dict:
+        generation = self.generation
+        return {
+            'generation': generation.number if generation else None,
+            'swept_at': generation.swept_at if generation else None,
+            'products': generation.catalog.size if generation else 0,
+            'stale_stores': list(generation.stale_stores) if generation else [],
+            'refresh_interval': self.refresh_interval,
+            'last_error': self.last_error,
+        }
@@ -1,8 +1,31 @@
 import logging
-from typing import List, Optional, Dict, Set
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Dict, Set, Type
 from .models.product import Product
 from .scrapers.base import BaseScraper
-from .utils import sorting, filtering
+from .catalog import ProductCatalog
+from .utils.filtering import ExclusionMatcher
+from .utils.logs import configure_logging
+from .scrapers.http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, HTTPCache
+from .changes import Change, ProductKey, diff_snapshots, merge_snapshots, snapshot
+from .metrics import ERRORS, SWEEP, TIMEOUTS, MetricsRegistry
+from .registry import create_scrapers
+
+if TYPE_CHECKING:
+    # Opt-in features, imported when they are first used so a plain sweep doesn't load
+    # numpy, sqlite3, shelve or multiprocessing
+    from .analytics import ProductTable
+    from .engine import SweepResult
+    from .history import PriceHistory
+    from .identity import CanonicalCatalog
+    from .locations import LocationResult, LocationSweep
+    from .scrapers.fixtures import FixtureCorpus
+    from .scrapers.parse_memo import ParseMemo
+    from .scrapers.parse_pool import ParsePool
+
+logger = logging.getLogger(__name__)
+
+# Scraper settings shared by every scraper of a tracker
+SHARED_SCRAPER_SETTINGS = ('http_cache', 'parse_memo', 'fixture_corpus', 'fixture_mode', 'metrics', 'parse_pool')
 
 class BarebellsTracker:
     def __init__(self, scrapers: Optional[List[BaseScraper]] = None):
@@ -10,42 +33,274 @@ class BarebellsTracker:
         self.scrapers = scrapers or []
         self._products: List[Product] = []
         self.excluded_patterns: Set[str] = set()  # Patterns to exclude
+        self._exclusion_matcher = ExclusionMatcher()
+        self.last_sweep: Optional['SweepResult'] = None
+        self.location_sweep: Optional['LocationSweep'] = None
+        self.metrics: Optional[MetricsRegistry] = None
+        self.history: Optional['PriceHistory'] = None
+        self._catalog: Optional[ProductCatalog] = None
+        self._table: Optional['ProductTable'] = None
+        self.identity: Optional['CanonicalCatalog'] = None
+        self._snapshot: Optional[Dict[ProductKey, Product]] = None
+        self.last_changes: List[Change] = []
+        self._change_sinks: List[Callable[[List[Change]], None]] = []
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        if not logging.getLogger().handlers:
+            # Nothing configured by the application
+            configure_logging()
     
     def add_scraper(self, scraper: BaseScraper) -> None:
         """Add a new scraper to the tracker."""
         self.scrapers.append(scraper)
         
+    def enable_http_cache(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> HTTPCache:
+        """Share one on-disk conditional-request cache between all scrapers."""
+        cache = HTTPCache(directory, max_bytes)
+        for scraper in self.scrapers:
+            scraper.http_cache = cache
+        return cache
+        
+    def enable_parse_memo(self,
+                          max_entries: Optional[int] = None,
+                          persist_path: Optional[str] = None,
+                          max_persisted: Optional[int] = None) -> 'ParseMemo':
+        """Share one parsed-result memo between all scrapers; sizes default to the parse_memo defaults."""
+        from .scrapers.parse_memo import DEFAULT_MAX_ENTRIES, DEFAULT_MAX_PERSISTED, ParseMemo
+        memo = ParseMemo(DEFAULT_MAX_ENTRIES if max_entries is None else max_entries,
+                         persist_path,
+                         DEFAULT_MAX_PERSISTED if max_persisted is None else max_persisted)
+        for scraper in self.scrapers:
+            scraper.parse_memo = memo
+        return memo
+        
+    def enable_parse_pool(self, workers: Optional[int] = None) -> 'ParsePool':
+        """Parse HTML responses on a pool of worker processes, one per core by default."""
+        from .scrapers.parse_pool import ParsePool
+        pool = ParsePool(workers)
+        for scraper in self.scrapers:
+            scraper.parse_pool = pool
+        return pool
+        
+    def use_fixtures(self, corpus: Optional['FixtureCorpus'], mode: str = 'replay') -> None:
+        """Record responses to ('record'), or replay them from ('replay'), a fixture corpus; None goes back to live."""
+        from .scrapers.fixtures import attach_corpus
+        attach_corpus(self.scrapers, corpus, mode)
+        
+    def enable_metrics(self) -> MetricsRegistry:
+        """Record per-store stage timings, bytes, products and errors of every sweep."""
+        self.metrics = MetricsRegistry()
+        for scraper in self.scrapers:
+            scraper.metrics = self.metrics
+        return self.metrics
+
+    def metrics_report(self) -> Dict:
+        """JSON-serializable report of the metrics so far, empty if metrics are off."""
+        return self.metrics.report() if self.metrics is not None else {}
+
+    def enable_history(self, path: Optional[str] = None) -> 'PriceHistory':
+        """Record every sweep in a persistent price history, price_history.db by default."""
+        from .history import DEFAULT_HISTORY_PATH, PriceHistory
+        self.history = PriceHistory(DEFAULT_HISTORY_PATH if path is None else path)
+        return self.history
+        
+    def enable_identity_resolution(self) -> 'CanonicalCatalog':
+        """Map every swept product to a canonical cross-store SKU."""
+        from .identity import CanonicalCatalog
+        self.identity = CanonicalCatalog()
+        self.identity.update(self._products)
+        return self.identity
+
+    def add_change_sink(self, sink: Callable[[List[Change]], None]) -> None:
+        """Call sink with the changes of every sweep that has any."""
+        self._change_sinks.append(sink)
+        
     def add_exclusion_pattern(self, pattern: str) -> None:
         """Add a pattern to exclude from results."""
         self.excluded_patterns.add(pattern.lower())
+        self._exclusion_matcher = ExclusionMatcher(self.excluded_patterns)
         
     def remove_exclusion_pattern(self, pattern: str) -> None:
         """Remove a pattern from exclusions."""
         self.excluded_patterns.discard(pattern.lower())
+        self._exclusion_matcher = ExclusionMatcher(self.excluded_patterns)
         
     def clear_exclusion_patterns(self) -> None:
         """Clear all exclusion patterns."""
         self.excluded_patterns.clear()
+        self._exclusion_matcher = ExclusionMatcher()
         
     def get_exclusion_patterns(self) -> Set[str]:
         """Get current exclusion patterns."""
         return self.excluded_patterns.copy()
+        
+    @property
+    def exclusion_matcher(self) -> ExclusionMatcher:
+        """Compiled matcher for the current exclusion patterns."""
+        if self._exclusion_matcher.patterns != self.excluded_patterns:
+            # Patterns were changed directly on the set
+            self._exclusion_matcher = ExclusionMatcher(self.excluded_patterns)
+        return self._exclusion_matcher
     
-    def run(self) -> List[Product]:
-        """Run all scrapers and collect products."""
-        self._products = []
+    def run(self,
+            concurrent: bool = False,
+            use_async: bool = False,
+            max_workers: int = 8,
+            per_store_limit: int = 1,
+            deadline: Optional[float] = None) -> List[Product]:
+        """
+        Run all scrapers and collect products.
+
+        With concurrent=True the scrapers run on a bounded worker pool, so a
+        sweep takes about as long as the slowest store. Stores that have not
+        finished when the deadline passes are dropped from the results.
+        With use_async=True the same limits apply, but scrapers run on an
+        event loop sharing one pooled async HTTP client.
+        """
+        if self.metrics is None:
+            return self._run(concurrent, use_async, max_workers, per_store_limit, deadline)
+        with self.metrics.timer(SWEEP, 'all'):
+            products = self._run(concurrent, use_async, max_workers, per_store_limit, deadline)
+        if self.last_sweep is not None and (concurrent or use_async):
+            for store in self.last_sweep.failed:
+                self.metrics.inc(ERRORS, store)
+            for store in self.last_sweep.timed_out:
+                self.metrics.inc(TIMEOUTS, store)
+        return products
+
+    def _run(self,
+             concurrent: bool,
+             use_async: bool,
+             max_workers: int,
+             per_store_limit: int,
+             deadline: Optional[float]) -> List[Product]:
+        if concurrent or use_async:
+            from .engine import run_async_sweep, run_concurrent
+            sweep = run_async_sweep if use_async else run_concurrent
+            self.last_sweep = sweep(
+                self.scrapers,
+                max_workers=max_workers,
+                per_store_limit=per_store_limit,
+                deadline=deadline
+            )
+            return self._on_sweep(self.last_sweep.products)
+
+        products = []
         for scraper in self.scrapers:
             try:
-                products = scraper.scrape_products()
-                self._products.extend(products)
+                products.extend(scraper.scrape_products())
             except Exception as e:
-                logging.error(f"Error with scraper {scraper.__class__.__name__}: {str(e)}")
+                logger.error("Error with scraper %s: %s", scraper.__class__.__name__, e)
+        return self._on_sweep(products)
+
+    def run_locations(self,
+                      chains: Dict[Type[BaseScraper], List[str]],
+                      on_result: Optional[Callable[['LocationResult'], None]] = None,
+                      **kwargs) -> 'LocationSweep':
+        """
+        Scrape many locations of location-priced chains (ICA, Willys, Hemkop).
+
+        Location scrapers share this tracker's caches and connection pools.
+        Their products are kept per location in location_sweep, apart from
+        the chain-wide products of run(). See locations.run_locations for
+        the keyword arguments.
+        """
+        from .locations import run_locations
+
+        def prepare(scraper: BaseScraper) -> None:
+            if self.scrapers:
+                for setting in SHARED_SCRAPER_SETTINGS:
+                    setattr(scraper, setting, getattr(self.scrapers[0], setting))
+
+        self.location_sweep = run_locations(chains, prepare=prepare, on_result=on_result, **kwargs)
+        return self.location_sweep
+
+    def get_location_products(self, store: str, location: str) -> List[Product]:
+        """Products of one location from the last location sweep."""
+        if self.location_sweep is None:
+            return []
+        return self.location_sweep.products(store.lower(), location)
+
+    def _on_sweep(self, products: List[Product]) -> List[Product]:
+        """Make a finished sweep's products current and record them."""
+        self._products = products
+        self._catalog = None
+        self._table = None
+        if self.history is not None:
+            try:
+                self.history.record(products)
+            except Exception as e:
+                logger.error("Error recording price history: %s", e)
+        if self.identity is not None:
+            self.identity.update(products)
+        self._detect_changes(products)
         return self._products
+
+    def _detect_changes(self, products: List[Product]) -> None:
+        """Diff against the previous snapshot and push the changes to the sinks."""
+        current = snapshot(products)
+        # Stores that returned nothing most likely failed; don't delist their products
+        swept_stores = {p.store for p in products}
+        if self._snapshot is None:
+            # First sweep is the baseline
+            self._snapshot = current
+            self.last_changes = []
+            return
+
+        self.last_changes = diff_snapshots(self._snapshot, current, swept_stores)
+        self._snapshot = merge_snapshots(self._snapshot, current, swept_stores)
+        self._notify(self.last_changes)
+
+    def _notify(self, changes: List[Change]) -> None:
+        """Push changes to the sinks."""
+        if not changes:
+            return
+        for sink in self._change_sinks:
+            try:
+                sink(changes)
+            except Exception as e:
+                logger.error("Error in change sink %r: %s", sink, e)
+
+    def update_store(self, store: str, products: List[Product]) -> List[Change]:
+        """
+        Replace one store's products with a fresh scrape of that store only.
+
+        Used by the poll scheduler, which refreshes stores independently.
+        A store's first update is its baseline and reports no changes.
+        """
+        self._products = [p for p in self._products if p.store != store] + products
+        self._catalog = None
+        self._table = None
+        if self.history is not None:
+            try:
+                self.history.record(products)
+            except Exception as e:
+                logger.error("Error recording price history: %s", e)
+        if self.identity is not None:
+            self.identity.update(products)
+
+        previous = self._snapshot or {}
+        current = snapshot(products)
+        if any(key[0] == store for key in previous):
+            self.last_changes = diff_snapshots(previous, current, {store})
+        else:
+            self.last_changes = []
+        self._snapshot = merge_snapshots(previous, current, {store})
+        self._notify(self.last_changes)
+        return self.last_changes
+    
+    @property
+    def catalog(self) -> ProductCatalog:
+        """Indexed view of the current products, built once per sweep on first use."""
+        if self._catalog is None:
+            self._catalog = ProductCatalog(self._products)
+        return self._catalog
+    
+    def get_product_table(self) -> 'ProductTable':
+        """Columnar NumPy table of the current products, built once per sweep."""
+        if self._table is None:
+            from .analytics import ProductTable
+            self._table = ProductTable.from_products(self._products)
+        return self._table
     
     def get_products(self, 
                     store: Optional[str] = None,
@@ -58,152 +313,53 @@ class BarebellsTracker:
                     reverse_sort: bool = False,
                     apply_exclusions: bool = True) -> List[Product]:
         """Get filtered and sorted products."""
-        products = self._products
-        
-        # Apply filters
-        if store:
-            products = filtering.filter_by_store(products, store)
-        
-        if package_size is not None:
-            products = filtering.filter_by_package_size(products, package_size)
-        
-        if min_price is not None or max_price is not None:
-            products = filtering.filter_by_price_range(products, min_price, max_price)
-        
-        if only_available:
-            products = filtering.filter_available(products)
-        
-        if min_stock is not None:
-            products = filtering.filter_in_stock(products, min_stock)
-            
-        # Apply pattern exclusions if enabled
-        if apply_exclusions and self.excluded_patterns:
-            products = filtering.filter_by_excluded_patterns(products, self.excluded_patterns)
-        
-        # Apply sorting
-        if sort_by:
-            if sort_by == 'price':
-                products = sorting.sort_by_price(products, reverse_sort)
-            elif sort_by == 'unit_price':
-                products = sorting.sort_by_per_unit_price(products, reverse_sort)
-            elif sort_by == 'package_size':
-                products = sorting.sort_by_package_size(products, reverse_sort)
-        
-        return products
+        return self.catalog.get_products(
+            store=store,
+            package_size=package_size,
+            min_price=min_price,
+            max_price=max_price,
+            only_available=only_available,
+            min_stock=min_stock,
+            sort_by=sort_by,
+            reverse_sort=reverse_sort,
+            exclusions=self.exclusion_matcher if apply_exclusions else None
+        )
     
     def get_store_summary(self) -> Dict[str, int]:
         """Get summary of product counts by store."""
-        summary = {}
-        for product in self._products:
-            summary[product.store] = summary.get(product.store, 0) + 1
-        return summary
+        return self.catalog.get_store_summary()
 
     def get_best_deals(self, package_size: Optional[int] = None, limit: int = 5, log: bool = False) -> List[Product]:
         """
         Get the best deals for given package size, removing duplicate prices from same store.
         """
-        products = self._products
-
         if log:
-            logging.info(f"Initial product count: {len(products)}")
-        
-        # Apply initial filters
-        if package_size is None:
-            products = filtering.filter_singles(products)
-            products = filtering.filter_by_price_range(products, max_price=100)
-        else:
-            products = filtering.filter_by_package_size(products, package_size)
-        
-        # Filter for available products and apply exclusions
-        products = filtering.filter_available(products)
-        if self.excluded_patterns:
-            products = filtering.filter_by_excluded_patterns(products, self.excluded_patterns)
-        
-        # Sort by appropriate price metric
-        if package_size and package_size > 1:
-            products = sorting.sort_by_per_unit_price(products)
-        else:
-            products = sorting.sort_by_price(products)
-        
-        # Remove duplicate prices from same store
-        seen_prices = {}  # Dictionary to track {(store, price): product}
-        unique_products = []
-        
-        for product in products:
-            price_key = (product.store, product.price if package_size is None else product.per_unit_price)
-            if price_key not in seen_prices:
-                seen_prices[price_key] = product
-                unique_products.append(product)
+            logger.info("Initial product count: %s", len(self._products))
         
-        # Get final results
-        final_products = unique_products[:limit]
+        final_products = self.catalog.get_best_deals(package_size, limit, self.exclusion_matcher)
         
         # Debug log the results
         if log:
             for product in final_products:
-                logging.info(f"Selected product: {product.name} at {product.price} SEK")
+                logger.info("Selected product: %s at %s SEK", product.name, product.price)
         
         return final_products
 
+    def get_best_deals_for_sizes(self, package_sizes: List[Optional[int]], limit: int = 5) -> Dict[Optional[int], List[Product]]:
+        """Best deals for several package sizes at once, from a single pass over the products."""
+        return self.catalog.get_best_deals_for_sizes(package_sizes, limit, self.exclusion_matcher)
+
+    def compare_prices(self, flavor: str, package_size: Optional[int] = None) -> Dict[str, Product]:
+        """Cheapest listing per store of the canonical product best matching a flavor."""
+        if self.identity is None:
+            self.enable_identity_resolution()
+        skus = self.identity.find(flavor)
+        return self.identity.prices_for(skus[0], package_size) if skus else {}
+
     def get_price_range(self, package_size: Optional[int] = None) -> Dict[str, float]:
         """Get price range statistics for given package size, respecting exclusions."""
-        # Start with base filtering
-        if package_size is None:
-            products = filtering.filter_singles(self._products)
-            products = filtering.filter_by_price_range(products, max_price=100)
-        else:
-            products = filtering.filter_by_package_size(self._products, package_size)
-        
-        # Apply availability filter and exclusions
-        products = filtering.filter_available(products)
-        if self.excluded_patterns:
-            products = filtering.filter_by_excluded_patterns(products, self.excluded_patterns)
-        
-        if not products:
-            return {
-                'min_price': None,
-                'max_price': None,
-                'avg_price': None
-            }
-        
-        # Use the appropriate price metric
-        if package_size and package_size > 1:
-            prices = [p.per_unit_price for p in products if p.per_unit_price is not None]
-        else:
-            prices = [p.price for p in products]
-        
-        return {
-            'min_price': min(prices) if prices else None,
-            'max_price': max(prices) if prices else None,
-            'avg_price': sum(prices) / len(prices) if prices else None
-        }
-
-def create_default_tracker() -> BarebellsTracker:
-    """Create a tracker instance with all available scrapers."""
-    from .scrapers.tyngre import TyngreScraper
-    from .scrapers.apotea import ApoteaScraper
-    from .scrapers.apohem import ApohemScraper
-    from .scrapers.meds import MedsScraper
-    from .scrapers.torebrings import TorebringsScraper
-    from .scrapers.sportkost import SportkostScraper
-    from .scrapers.gymgrossisten import GymgrossistenScraper
-    from .scrapers.mmsports import MMSportsScraper
-    from .scrapers.hemkop import HemkopScraper
-    from .scrapers.willys import WillysScraper
-    from .scrapers.ica import ICAScraper
-    
-    scrapers = [
-        TyngreScraper(),
-        ApoteaScraper(),
-        ApohemScraper(),
-        MedsScraper(),
-        TorebringsScraper(),
-        SportkostScraper(),
-        GymgrossistenScraper(),
-        MMSportsScraper(),
-        HemkopScraper(),
-        WillysScraper(),
-        ICAScraper()
-    ]
-    
-    return BarebellsTracker(scrapers)
+        return self.catalog.get_price_range(package_size, self.exclusion_matcher)
+
+def create_default_tracker(stores: Optional[Iterable[str]] = None) -> BarebellsTracker:
+    """Create a tracker with scrapers for the given store names, or all available stores."""
+    return BarebellsTracker(create_scrapers(stores))
@@ -1,6 +1,10 @@
-from typing import List, Optional, Set
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
 from ..models.product import Product
 import logging
+import re
+
+logger = logging.getLogger(__name__)
 
 def filter_by_store(products: List[Product], store: str) -> List[Product]:
     """Filter products by store name."""
@@ -48,6 +52,48 @@ def filter_multipacks(products: List[Product]) -> List[Product]:
     """Filter for multipacks only."""
     return [p for p in products if p.is_multipack]
 
+class ExclusionMatcher:
+    """
+    Compiled matcher for exclusion patterns.
+
+    All patterns are combined into one regex, built once per pattern set.
+    Verdicts are cached per product name, so names seen in earlier sweeps
+    are not matched again.
+    """
+    MAX_CACHED_VERDICTS = 100_000
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.patterns: FrozenSet[str] = frozenset(p.lower() for p in patterns)
+        # Longest first so the alternation prefers the most specific pattern
+        alternatives = sorted(self.patterns, key=len, reverse=True)
+        self._regex = re.compile('|'.join(map(re.escape, alternatives))) if alternatives else None
+        self._verdicts: Dict[str, bool] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def is_excluded(self, name: str) -> bool:
+        """Whether the name contains any of the patterns, case-insensitively."""
+        verdict = self._verdicts.get(name)
+        if verdict is None:
+            if len(self._verdicts) >= self.MAX_CACHED_VERDICTS:
+                self._verdicts.clear()
+            verdict = self._verdicts[name] = self._regex is not None and self._regex.search(name.lower()) is not None
+        return verdict
+
+    def filter(self, products: List[Product]) -> List[Product]:
+        """Products whose names match none of the patterns."""
+        if self._regex is None:
+            return products
+        return [p for p in products if not self.is_excluded(p.name)]
+
+
+@lru_cache(maxsize=32)
+def get_exclusion_matcher(patterns: FrozenSet[str]) -> ExclusionMatcher:
+    """Shared matcher for a pattern set."""
+    return ExclusionMatcher(patterns)
+
+
 def filter_by_excluded_patterns(products: List[Product], excluded_patterns: Set[str] = None) -> List[Product]:
     """
     Filter out products containing any of the excluded patterns in their name.
@@ -63,19 +109,6 @@ def filter_by_excluded_patterns(products: List[Product], excluded_patterns: Set[
     if not excluded_patterns:
         return products
     
-    filtered_products = []
-    for product in products:
-        name_lower = product.name.lower()
-        should_include = True
-        
-        for pattern in excluded_patterns:
-            if pattern.lower() in name_lower:
-                logging.info(f"Excluding product due to pattern '{pattern}': {product.name}")
-                should_include = False
-                break
-                
-        if should_include:
-            filtered_products.append(product)
-            
-    #logging.info(f"Filtered out {len(products) - len(filtered_products)} products with patterns: {excluded_patterns}")
+    filtered_products = get_exclusion_matcher(frozenset(excluded_patterns)).filter(products)
+    logger.debug("Filtered out %s products with patterns: %s", len(products) - len(filtered_products), excluded_patterns)
     return filtered_products
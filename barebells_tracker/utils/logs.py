@@ -0,0 +1,148 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DEFAULT_RATE_LIMIT = 10      # Records per message template per period
+DEFAULT_RATE_PERIOD = 60.0   # Seconds
+
+# LogRecord attributes that are not user-supplied extra fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener: Optional[QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most `rate` records per message template per `period`.
+
+    Records are keyed by logger and unformatted message, so every
+    "Excluded product: %s" counts as one message type whatever its
+    arguments. Records at limit_below and above (warnings and errors by
+    default) always pass, so a failing store is never hidden behind
+    another. The first record after a suppressed stretch carries the
+    number of records dropped in its `suppressed` attribute.
+    """
+
+    def __init__(self,
+                 rate: int = DEFAULT_RATE_LIMIT,
+                 period: float = DEFAULT_RATE_PERIOD,
+                 limit_below: int = logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.period = period
+        self.limit_below = limit_below
+        self._windows: Dict[Tuple[str, str], list] = {}  # key -> [window start, count, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.limit_below:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.rate:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records as they are.
+
+    The stdlib handler formats each record on the calling thread, merging
+    the traceback into the message, so it can be pickled. Records here
+    never leave the process, so message formatting, tracebacks included,
+    is left to the listener thread. Log arguments are formatted there
+    too, so they should not be mutated after logging.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        return f"{text} ({suppressed} similar messages suppressed)" if suppressed else text
+
+
+def _stop_listener() -> None:
+    # Flush what's queued at exit, unless the application already stopped the listener
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def configure_logging(level: int = logging.INFO,
+                      json_format: bool = False,
+                      rate: Optional[int] = DEFAULT_RATE_LIMIT,
+                      period: float = DEFAULT_RATE_PERIOD,
+                      handler: Optional[logging.Handler] = None) -> QueueListener:
+    """
+    Send root logging through a queue to a background thread.
+
+    Callers only enqueue records; formatting and I/O happen on the
+    listener thread. Records below WARNING are rate limited per message
+    template before they are queued. Only the first call configures anything, so
+    libraries and apps can both call it safely.
+
+    Args:
+        level: Root logger level
+        json_format: One JSON object per line instead of plain text
+        rate: Records below WARNING let through per message template per period, None for all
+        period: Rate limit window in seconds
+        handler: Where records end up, stderr by default
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return _listener
+        root = logging.getLogger()
+        root.setLevel(level)
+
+        handler = handler or logging.StreamHandler()
+        handler.setFormatter(JSONFormatter() if json_format else _TextFormatter(DEFAULT_FORMAT))
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(records)
+        if rate is not None:
+            queue_handler.addFilter(RateLimitFilter(rate, period))
+        root.addHandler(queue_handler)
+
+        _listener = QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+        return _listener
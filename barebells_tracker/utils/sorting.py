@@ -1,4 +1,5 @@
-from typing import List
+import heapq
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
 from ..models.product import Product
 
 def sort_by_price(products: List[Product], reverse: bool = False) -> List[Product]:
@@ -28,3 +29,78 @@ def sort_by_package_size(products: List[Product], reverse: bool = False) -> List
         reverse=reverse
     )
     return sorted_products + products_without_size
+
+def _rank(value: Optional[float], index: int) -> Tuple:
+    """Sort rank putting None values last and keeping input order on ties."""
+    return (1, 0.0, index) if value is None else (0, value, index)
+
+class TopKUnique:
+    """
+    Streaming top-k selection with deduplication.
+
+    Keeps the best-ranked product among those sharing a unique key, and
+    the k products with the lowest sort key overall, like a stable sort
+    followed by dedup and slicing. Holds a max-heap of at most k live
+    entries plus the rank of every key in it, so memory is O(k) and each
+    add is O(log k). A key evicted from the heap can only come back with a
+    better rank, so forgetting it is safe.
+    """
+
+    def __init__(self,
+                 k: int,
+                 sort_key: Callable[[Product], Optional[float]],
+                 unique_key: Callable[[Product], Hashable]):
+        self.k = k
+        self.sort_key = sort_key
+        self.unique_key = unique_key
+        # Entries are (negated rank, rank, key, product); entries whose rank no longer matches _ranks are stale
+        self._heap: List[Tuple[Tuple, Tuple, Hashable, Product]] = []
+        self._ranks: Dict[Hashable, Tuple] = {}
+        self._count = 0
+
+    def _push(self, rank: Tuple, key: Hashable, product: Product) -> None:
+        self._ranks[key] = rank
+        heapq.heappush(self._heap, (tuple(-x for x in rank), rank, key, product))
+
+    def _pop_stale(self) -> None:
+        while self._heap and self._ranks.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def add(self, product: Product) -> None:
+        if self.k <= 0:
+            return
+        rank = _rank(self.sort_key(product), self._count)
+        self._count += 1
+        key = self.unique_key(product)
+
+        current = self._ranks.get(key)
+        if current is not None:
+            if rank < current:
+                self._push(rank, key, product)  # The old entry goes stale
+                if len(self._heap) > 2 * self.k:
+                    self._heap = [entry for entry in self._heap if self._ranks.get(entry[2]) == entry[1]]
+                    heapq.heapify(self._heap)
+            return
+        if len(self._ranks) < self.k:
+            self._push(rank, key, product)
+            return
+
+        self._pop_stale()
+        if rank < self._heap[0][1]:
+            _, _, worst, _ = heapq.heappop(self._heap)
+            del self._ranks[worst]
+            self._push(rank, key, product)
+
+    def result(self) -> List[Product]:
+        live = [entry for entry in self._heap if self._ranks.get(entry[2]) == entry[1]]
+        return [product for _, _, _, product in sorted(live, key=lambda entry: entry[1])]
+
+def top_k_unique(products: Iterable[Product],
+                 k: int,
+                 sort_key: Callable[[Product], Optional[float]],
+                 unique_key: Callable[[Product], Hashable]) -> List[Product]:
+    """The k products with the lowest sort key, one per unique key."""
+    selector = TopKUnique(k, sort_key, unique_key)
+    for product in products:
+        selector.add(product)
+    return selector.result()
@@ -0,0 +1,71 @@
+"""
+Compare parse time per store between the lxml and bs4 parser back-ends.
+
+Saved pages are raw response bodies named after the store, e.g.
+pages/apotea.html or pages/sportkost.json. Run from the repository root:
+
+    python -m benchmarks.parse_bench pages/ --repeat 20
+"""
+import argparse
+import os
+import time
+from barebells_tracker.scrapers import html_parser
+from barebells_tracker.scrapers.base import FetchResult
+from barebells_tracker.scrapers.apotea import ApoteaScraper
+from barebells_tracker.scrapers.gymgrossisten import GymgrossistenScraper
+from barebells_tracker.scrapers.meds import MedsScraper
+from barebells_tracker.scrapers.mmsports import MMSportsScraper
+from barebells_tracker.scrapers.sportkost import SportkostScraper
+from barebells_tracker.scrapers.torebrings import TorebringsScraper
+
+HTML_SCRAPERS = [
+    ApoteaScraper,
+    GymgrossistenScraper,
+    MedsScraper,
+    MMSportsScraper,
+    SportkostScraper,
+    TorebringsScraper,
+]
+
+
+def time_parse(scraper, data, repeat: int) -> float:
+    """Best-of-repeat parse time in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scraper.parse_products(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', help='Directory with saved pages')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    backends = [html_parser.BACKEND_BS4]
+    if html_parser.LXML_AVAILABLE:
+        backends.insert(0, html_parser.BACKEND_LXML)
+
+    print(f"{'store':<15}" + ''.join(f"{b + ' ms':>12}" for b in backends) + f"{'speedup':>10}")
+    for scraper_cls in HTML_SCRAPERS:
+        scraper = scraper_cls()
+        page = next((os.path.join(args.pages, name) for name in os.listdir(args.pages)
+                     if os.path.splitext(name)[0] == scraper.store_name), None)
+        if page is None:
+            continue
+        with open(page, encoding='utf-8') as f:
+            data = scraper.decode(FetchResult(page, 200, f.read()))
+
+        timings = []
+        for backend in backends:
+            html_parser.set_backend(backend)
+            timings.append(time_parse(scraper, data, args.repeat))
+
+        speedup = f"{timings[-1] / timings[0]:.1f}x" if len(timings) > 1 and timings[0] else '-'
+        print(f"{scraper.store_name:<15}" + ''.join(f"{t:>12.2f}" for t in timings) + f"{speedup:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Replay recorded responses through every store's parser, fully offline.
+
+Record a corpus from the live sites once:
+
+    python -m benchmarks.replay_bench fixtures/ --record
+
+Then benchmark parsing from it as often as needed:
+
+    python -m benchmarks.replay_bench fixtures/ --repeat 20
+"""
+import argparse
+import time
+import tracemalloc
+from barebells_tracker.scrapers.fixtures import CORPUS_VERSION, MODE_RECORD, FixtureCorpus
+from barebells_tracker.tracker import create_default_tracker
+
+
+def measure(scraper, responses, repeat: int) -> dict:
+    """Wall time, CPU time, allocations and throughput of decode + parse."""
+    decoded = [scraper.decode(result) for result in responses]
+
+    # Allocation pass, kept separate since tracing slows everything down
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    product_count = sum(len(scraper.parse_products(data)) for data in decoded)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(repeat):
+        for data in decoded:
+            scraper.parse_products(data)
+    wall = (time.perf_counter() - wall_start) / repeat
+    cpu = (time.process_time() - cpu_start) / repeat
+
+    return {
+        'products': product_count,
+        'wall_ms': wall * 1000,
+        'cpu_ms': cpu * 1000,
+        'peak_kib': peak / 1024,
+        'blocks': blocks,
+        'products_per_sec': product_count / wall if wall else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', help='Fixture corpus directory')
+    parser.add_argument('--version', type=int, default=CORPUS_VERSION, help='Corpus version')
+    parser.add_argument('--record', action='store_true', help='Record a fresh corpus from the live sites')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = FixtureCorpus(args.corpus, args.version)
+    tracker = create_default_tracker()
+
+    if args.record:
+        tracker.use_fixtures(corpus, MODE_RECORD)
+        products = tracker.run(concurrent=True)
+        print(f"Recorded {len(products)} products from {len(corpus.stores())} stores into {corpus.directory}")
+        return
+
+    print(f"{'store':<15}{'products':>10}{'wall ms':>10}{'cpu ms':>10}{'peak KiB':>10}{'blocks':>10}{'prod/s':>12}")
+    for scraper in tracker.scrapers:
+        responses = corpus.responses(scraper.store_name)
+        if not responses:
+            print(f"{scraper.store_name:<15}{'no fixtures':>10}")
+            continue
+        stats = measure(scraper, responses, args.repeat)
+        print(f"{scraper.store_name:<15}{stats['products']:>10}{stats['wall_ms']:>10.2f}{stats['cpu_ms']:>10.2f}"
+              f"{stats['peak_kib']:>10.0f}{stats['blocks']:>10}{stats['products_per_sec']:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,89 @@
+import argparse
+from barebells_tracker.registry import SCRAPERS
 from barebells_tracker.tracker import create_default_tracker
+from barebells_tracker.utils.logs import configure_logging
+
+def poll(tracker):
+    """Keep polling every store on its own adaptive interval, printing price changes."""
+    from barebells_tracker.scheduler import PollScheduler
+    tracker.enable_history()
+    tracker.add_change_sink(lambda changes: print("\n".join(str(c) for c in changes)))
+    scheduler = PollScheduler(tracker)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+def serve(tracker, port=None, refresh_interval=None):
+    """Serve the latest sweep over a local JSON API, sweeping again in the background."""
+    from barebells_tracker.service import DEFAULT_PORT, DEFAULT_REFRESH_INTERVAL, QueryService
+    service = QueryService(tracker,
+                           port=port or DEFAULT_PORT,
+                           refresh_interval=refresh_interval or DEFAULT_REFRESH_INTERVAL)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        service.shutdown()
 
 def main():
-    # Create tracker with all scrapers
-    tracker = create_default_tracker()
+    parser = argparse.ArgumentParser(description="Track Barebells prices across stores")
+    parser.add_argument('--stores', metavar='NAMES',
+                        help=f"comma-separated stores to track (default all built-in: {', '.join(SCRAPERS)})")
+    parser.add_argument('--poll', action='store_true', help="keep polling stores instead of sweeping once")
+    parser.add_argument('--serve', type=int, nargs='?', const=0, metavar='PORT',
+                        help="serve deals over a local JSON API (port 8080 by default)")
+    parser.add_argument('--refresh', type=float, metavar='SECONDS',
+                        help="seconds between sweeps when serving (15 minutes by default)")
+    parser.add_argument('--parse-workers', type=int, metavar='N',
+                        help="parse HTML stores on N worker processes")
+    parser.add_argument('--json-logs', action='store_true', help="log one JSON object per line")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="write a JSON run report of stage timings, or Prometheus text if PATH ends in .prom")
+    args = parser.parse_args()
+    configure_logging(json_format=args.json_logs)
+
+    # Create tracker with the selected scrapers, all by default
+    stores = [name for name in args.stores.split(',') if name.strip()] if args.stores else None
+    try:
+        tracker = create_default_tracker(stores)
+    except ValueError as e:
+        parser.error(str(e))
     tracker.add_exclusion_pattern('chewy')
+    if args.metrics:
+        tracker.enable_metrics()
+    if args.parse_workers:
+        tracker.enable_parse_pool(args.parse_workers)
+
+    if args.poll:
+        poll(tracker)
+        return
+    if args.serve is not None:
+        serve(tracker, args.serve, args.refresh)
+        return
     
-    # Run all scrapers
-    tracker.run()
+    # Run all scrapers concurrently, giving up on stores that take too long
+    tracker.run(concurrent=True, deadline=30)
+    if args.metrics:
+        with open(args.metrics, 'w') as f:
+            f.write(tracker.metrics.to_prometheus() if args.metrics.endswith('.prom') else tracker.metrics.to_json())
     
     # Print store summary
     print("\nProducts found by store:")
     for store, count in tracker.get_store_summary().items():
         print(f"{store}: {count} products")
     
+    # Best deals for single bars and 12-packs in one pass
+    best_deals = tracker.get_best_deals_for_sizes([None, 12], limit=7)
+    
     # Print best deals for single bars
     print("\nBest deals for single bars:")
-    for product in tracker.get_best_deals(package_size=None, limit=7):
+    for product in best_deals[None]:
         print(f"- {product.name} at {product.price:.2f} SEK from {product.store}")
         print(f"- {product.url}")
     
     # Print best deals for 12-packs
     print("\nBest deals for 12-packs:")
-    for product in tracker.get_best_deals(package_size=12, limit=7):
+    for product in best_deals[12]:
         print(f"- {product.name}")
         print(f"  Total price: {product.price:.2f} SEK")
         print(f"  Price per bar: {product.per_unit_price:.2f} SEK")
@@ -0,0 +1,161 @@
+import itertools
+import random
+from typing import Dict, List, Optional, Set
+
+import pytest
+
+from barebells_tracker.catalog import ProductCatalog
+from barebells_tracker.models.product import Product
+from barebells_tracker.utils import filtering, sorting
+from barebells_tracker.utils.filtering import ExclusionMatcher
+
+NAMES = ['Barebells Salty Peanut', 'Barebells Chewy Caramel', 'Soft bar Cookies',
+         'Barebells 12-pack Mint', 'Barebells Cola 12 x 55g']
+EXCLUSIONS = [set(), {'chewy'}, {'soft', 'mint'}]
+
+
+def random_products(rng: random.Random, count: int) -> List[Product]:
+    return [
+        Product(
+            name=rng.choice(NAMES) + str(rng.randint(0, 3)),
+            price=rng.choice([19.9, 20, 22, 25, 99, 150, 240, 300]),
+            url=f'u{rng.randint(0, 10)}',
+            store=rng.choice(['ica', 'Willys', 'apotea']),
+            package_size=rng.choice([None, 1, 12, None]),
+            per_unit_price=rng.choice([None, None, 20.0, 19.5]),
+            stock=rng.choice([None, 0, 3, 10]),
+            available=rng.random() < 0.8
+        )
+        for _ in range(count)
+    ]
+
+
+# Reference implementations: the filter and sort chains the catalog replaced
+
+def reference_products(products: List[Product], excluded: Set[str], store=None, package_size=None,
+                       min_price=None, max_price=None, only_available=True, min_stock=None,
+                       sort_by=None, reverse_sort=False, apply_exclusions=True) -> List[Product]:
+    if store:
+        products = filtering.filter_by_store(products, store)
+    if package_size is not None:
+        products = filtering.filter_by_package_size(products, package_size)
+    if min_price is not None or max_price is not None:
+        products = filtering.filter_by_price_range(products, min_price, max_price)
+    if only_available:
+        products = filtering.filter_available(products)
+    if min_stock is not None:
+        products = filtering.filter_in_stock(products, min_stock)
+    if apply_exclusions and excluded:
+        products = filtering.filter_by_excluded_patterns(products, excluded)
+    if sort_by == 'price':
+        products = sorting.sort_by_price(products, reverse_sort)
+    elif sort_by == 'unit_price':
+        products = sorting.sort_by_per_unit_price(products, reverse_sort)
+    elif sort_by == 'package_size':
+        products = sorting.sort_by_package_size(products, reverse_sort)
+    return products
+
+
+def _base(products: List[Product], excluded: Set[str], package_size: Optional[int]) -> List[Product]:
+    if package_size is None:
+        products = filtering.filter_singles(products)
+        products = filtering.filter_by_price_range(products, max_price=100)
+    else:
+        products = filtering.filter_by_package_size(products, package_size)
+    products = filtering.filter_available(products)
+    if excluded:
+        products = filtering.filter_by_excluded_patterns(products, excluded)
+    return products
+
+
+def reference_best_deals(products: List[Product], excluded: Set[str],
+                         package_size: Optional[int], limit: int) -> List[Product]:
+    products = _base(products, excluded, package_size)
+    if package_size and package_size > 1:
+        products = sorting.sort_by_per_unit_price(products)
+    else:
+        products = sorting.sort_by_price(products)
+    seen = set()
+    deals = []
+    for p in products:
+        key = (p.store, p.price if package_size is None else p.per_unit_price)
+        if key not in seen:
+            seen.add(key)
+            deals.append(p)
+    return deals[:limit]
+
+
+def reference_price_range(products: List[Product], excluded: Set[str],
+                          package_size: Optional[int]) -> Dict[str, Optional[float]]:
+    products = _base(products, excluded, package_size)
+    if package_size and package_size > 1:
+        prices = [p.per_unit_price for p in products if p.per_unit_price is not None]
+    else:
+        prices = [p.price for p in products]
+    return {
+        'min_price': min(prices) if prices else None,
+        'max_price': max(prices) if prices else None,
+        'avg_price': sum(prices) / len(prices) if prices else None
+    }
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_best_deals_and_price_range_match_reference(seed):
+    rng = random.Random(seed)
+    products = random_products(rng, rng.randint(0, 40))
+    catalog = ProductCatalog(products)
+    for excluded in EXCLUSIONS:
+        matcher = ExclusionMatcher(excluded)
+        for size in [None, 1, 12]:
+            for limit in [1, 3, 7]:
+                assert catalog.get_best_deals(size, limit, matcher) == \
+                    reference_best_deals(products, excluded, size, limit)
+            assert catalog.get_price_range(size, matcher) == reference_price_range(products, excluded, size)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_get_products_matches_reference(seed):
+    rng = random.Random(seed)
+    products = random_products(rng, rng.randint(0, 40))
+    catalog = ProductCatalog(products)
+    options = itertools.product(
+        [None, 'ica', 'WILLYS'], [None, 1, 12], [None, 20], [None, 100], [True, False],
+        [None, 3], [None, 'price', 'unit_price', 'package_size', 'unknown'], [False, True], [True, False]
+    )
+    for excluded in EXCLUSIONS:
+        matcher = ExclusionMatcher(excluded)
+        for (store, size, min_price, max_price, only_available,
+             min_stock, sort_by, reverse_sort, apply_exclusions) in options:
+            kwargs = dict(store=store, package_size=size, min_price=min_price, max_price=max_price,
+                          only_available=only_available, min_stock=min_stock, sort_by=sort_by,
+                          reverse_sort=reverse_sort)
+            assert catalog.get_products(exclusions=matcher if apply_exclusions else None, **kwargs) == \
+                reference_products(products, excluded, apply_exclusions=apply_exclusions, **kwargs)
+
+
+def test_store_summary_counts_in_order_of_first_appearance():
+    products = random_products(random.Random(0), 30)
+    summary = {}
+    for p in products:
+        summary[p.store] = summary.get(p.store, 0) + 1
+    assert list(ProductCatalog(products).get_store_summary().items()) == list(summary.items())
+
+
+def test_best_deals_walk_stops_after_limit():
+    products = [Product(f'Bar {i}', 20 + i, f'u{i}', 'ica', package_size=1) for i in range(1000)]
+    catalog = ProductCatalog(products)
+    catalog.get_best_deals(None, 1)  # Builds the sorted view
+    visited = []
+    catalog.products = _Recording(catalog.products, visited)
+    assert [p.url for p in catalog.get_best_deals(None, 5)] == ['u0', 'u1', 'u2', 'u3', 'u4']
+    assert len(visited) <= 10
+
+
+class _Recording(list):
+    def __init__(self, items, visited):
+        super().__init__(items)
+        self.visited = visited
+
+    def __getitem__(self, i):
+        self.visited.append(i)
+        return super().__getitem__(i)
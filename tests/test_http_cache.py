@@ -0,0 +1,45 @@
+from barebells_tracker.models.product import Product
+from barebells_tracker.scrapers.base import BaseScraper, FetchResult
+from barebells_tracker.scrapers.http_cache import CacheEntry, HTTPCache
+
+URL = 'https://example.com/bars'
+
+
+class ExampleScraper(BaseScraper):
+    def get_headers(self):
+        return {}
+
+    def get_product_urls(self):
+        return [URL]
+
+    def parse_products(self, response_data):
+        return [Product(item['name'], item['price'], URL, self.store_name) for item in response_data]
+
+
+def scraper_with_cache(tmp_path) -> ExampleScraper:
+    scraper = ExampleScraper()
+    scraper.http_cache = HTTPCache(str(tmp_path))
+    return scraper
+
+
+def test_entry_is_reused_by_the_parser_that_wrote_it(tmp_path):
+    scraper = scraper_with_cache(tmp_path)
+    result = FetchResult(URL, 200, '[{"name": "Bar", "price": 25}]', {'ETag': '"v1"'})
+    products = scraper.process(result)
+
+    entry = scraper._cached_entry(URL)
+    assert entry is not None
+    assert entry.products == products
+    assert scraper._request_headers(entry)['If-None-Match'] == '"v1"'
+
+
+def test_entry_from_another_parser_is_ignored(tmp_path):
+    scraper = scraper_with_cache(tmp_path)
+    stale = Product('Bar', 1, URL, 'example')
+    scraper.http_cache.put(scraper.cache_key(URL), CacheEntry(URL, '[]', etag='"v1"', products=[stale],
+                                                              parser='example#0000'))
+    assert scraper._cached_entry(URL) is None
+
+    # Entries pickled before parsers were recorded
+    scraper.http_cache.put(scraper.cache_key(URL), CacheEntry(URL, '[]', etag='"v1"', products=[stale]))
+    assert scraper._cached_entry(URL) is None
@@ -0,0 +1,44 @@
+import time
+
+from barebells_tracker.locations import run_locations
+from barebells_tracker.models.product import Product
+from barebells_tracker.scrapers.base import BaseScraper
+
+# Later locations finish first
+DELAYS = {'a': 0.06, 'b': 0.03, 'c': 0.0}
+
+
+class ChainScraper(BaseScraper):
+    def __init__(self, location: str):
+        super().__init__()
+        self.location = location
+
+    def get_headers(self):
+        return {}
+
+    def get_product_urls(self):
+        return []
+
+    def parse_products(self, response_data):
+        return []
+
+    def scrape_products(self):
+        if self.location == 'broken':
+            raise RuntimeError("store closed")
+        time.sleep(DELAYS[self.location])
+        return [Product('Bar', 25.0, f'https://chain.example/{self.location}/bar', self.store_name,
+                        location=self.location)]
+
+
+def test_duplicates_point_to_the_first_location_in_input_order():
+    sweep = run_locations({ChainScraper: ['a', 'b', 'c']}, max_workers=3)
+    duplicates = {location: result.duplicate_of for (_, location), result in sweep.results.items()}
+    assert duplicates == {'a': None, 'b': 'a', 'c': 'a'}
+    assert len(sweep.catalogs('chain')) == 1
+
+
+def test_failed_locations_are_reported_to_on_result():
+    seen = []
+    sweep = run_locations({ChainScraper: ['c', 'broken']}, on_result=seen.append)
+    assert sorted(result.location for result in seen) == ['broken', 'c']
+    assert sweep.results[('chain', 'broken')].error == "store closed"
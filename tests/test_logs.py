@@ -0,0 +1,34 @@
+import json
+import logging
+import sys
+
+from barebells_tracker.utils.logs import DeferredQueueHandler, JSONFormatter, RateLimitFilter
+
+
+def record(level: int, msg: str, *args, exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord('test', level, __file__, 1, msg, args, exc_info)
+
+
+def test_rate_limit_applies_per_template_below_warning():
+    limiter = RateLimitFilter(rate=2, period=60)
+    passed = [limiter.filter(record(logging.INFO, "Excluded product: %s", i)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+
+
+def test_warnings_and_errors_are_never_rate_limited():
+    limiter = RateLimitFilter(rate=1, period=60)
+    assert all(limiter.filter(record(logging.ERROR, "Error scraping %s: %s", f'store{i}', 'x')) for i in range(5))
+
+
+def test_queued_records_keep_their_traceback_for_the_formatter():
+    try:
+        raise ZeroDivisionError
+    except ZeroDivisionError:
+        exc_info = sys.exc_info()
+    queued = DeferredQueueHandler(None).prepare(record(logging.ERROR, "boom %s", 1, exc_info=exc_info))
+    assert queued.exc_info is exc_info
+    assert queued.msg == "boom %s"
+
+    entry = json.loads(JSONFormatter().format(queued))
+    assert entry['message'] == 'boom 1'
+    assert 'ZeroDivisionError' in entry['exception']
@@ -0,0 +1,44 @@
+from barebells_tracker.scrapers import parse_pool
+from barebells_tracker.scrapers.base import BaseScraper
+
+
+class ChainScraper(BaseScraper):
+    def __init__(self, location=None):
+        super().__init__()
+        self.location = location
+
+    def get_headers(self):
+        return {}
+
+    def get_product_urls(self):
+        return []
+
+    def parse_products(self, response_data):
+        return []
+
+
+def worker_scraper(scraper: BaseScraper) -> BaseScraper:
+    cls = type(scraper)
+    return parse_pool._worker_scraper(cls.__module__, cls.__qualname__, scraper.parse_state())
+
+
+def test_sweep_deadline_does_not_reach_workers():
+    parse_pool._worker_scrapers.clear()
+    scraper = ChainScraper()
+    rebuilt = set()
+    for sweep in range(5):
+        scraper.deadline_at = 1000.0 + sweep
+        rebuilt.add(id(worker_scraper(scraper)))
+    assert 'deadline_at' not in scraper.parse_state()
+    assert len(rebuilt) == 1
+    assert len(parse_pool._worker_scrapers) == 1
+
+
+def test_worker_scrapers_are_capped():
+    parse_pool._worker_scrapers.clear()
+    first = ChainScraper('0')
+    kept = worker_scraper(first)
+    for location in range(1, parse_pool.MAX_WORKER_SCRAPERS * 2):
+        worker_scraper(ChainScraper(str(location)))
+        assert worker_scraper(first) is kept  # Recently used, so never evicted
+    assert len(parse_pool._worker_scrapers) == parse_pool.MAX_WORKER_SCRAPERS
@@ -0,0 +1,44 @@
+import asyncio
+
+from barebells_tracker.scrapers.retry import async_hedged
+
+
+def test_cancelled_caller_cancels_both_requests():
+    started, finished, cancelled = [], [], []
+
+    async def request():
+        started.append(1)
+        try:
+            await asyncio.sleep(0.2)
+            finished.append(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def sweep():
+        caller = asyncio.ensure_future(async_hedged(request, hedge_after=0.01))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0.3)
+
+    asyncio.run(sweep())
+    assert len(started) == 2
+    assert len(cancelled) == 2
+    assert not finished
+
+
+def test_slower_request_is_cancelled_when_one_wins():
+    delays = [0.2, 0.0]
+    cancelled = []
+
+    async def request():
+        try:
+            await asyncio.sleep(delays.pop(0))
+            return 'done'
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    assert asyncio.run(async_hedged(request, hedge_after=0.01)) == 'done'
+    assert cancelled == [1]
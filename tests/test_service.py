@@ -0,0 +1,66 @@
+import pytest
+
+from barebells_tracker.catalog import ProductCatalog
+from barebells_tracker.models.product import Product
+from barebells_tracker.service import Generation, QueryError, QueryService
+from barebells_tracker.utils.filtering import ExclusionMatcher
+
+
+class FakeTracker:
+    def __init__(self, sweeps):
+        self.sweeps = list(sweeps)
+        self.exclusion_matcher = ExclusionMatcher(set())
+        self.catalog = ProductCatalog([])
+
+    def run(self, **kwargs):
+        products = self.sweeps.pop(0)
+        self.catalog = ProductCatalog(products)
+        return products
+
+
+def product(store: str, name: str, price: float) -> Product:
+    return Product(name, price, f'https://{store}.example/{name}', store, price / 12, 12)
+
+
+@pytest.fixture
+def service_for():
+    services = []
+
+    def build(*sweeps):
+        service = QueryService(FakeTracker(sweeps), port=0)
+        services.append(service)
+        return service
+
+    yield build
+    for service in services:
+        service.server.server_close()
+
+
+def test_failed_store_keeps_its_previous_products(service_for):
+    service = service_for(
+        [product('apotea', 'Bar', 300), product('tyngre', 'Bar', 280)],
+        [product('apotea', 'Bar', 290)],
+        [],
+    )
+    service.refresh()
+    generation = service.refresh()
+    assert {(p.store, p.price) for p in generation.catalog.products} == {('apotea', 290), ('tyngre', 280)}
+    assert generation.stale_stores == ('tyngre',)
+
+    generation = service.refresh()
+    assert generation.catalog.size == 2
+    assert generation.stale_stores == ('apotea', 'tyngre')
+
+
+def test_etags_differ_between_processes(service_for):
+    first = service_for([product('apotea', 'Bar', 300)]).refresh()
+    second = service_for([product('apotea', 'Bar', 300)]).refresh()
+    assert first.number == second.number
+    assert first.etag != second.etag
+
+
+def test_zero_limit_is_rejected():
+    generation = Generation(1, ProductCatalog([product('apotea', 'Bar', 300)]), ExclusionMatcher(set()))
+    with pytest.raises(QueryError):
+        generation.response('/best-deals', (('limit', '0'),))
+    assert b'"Bar"' in generation.response('/best-deals', (('package_size', '12'),))
@@ -0,0 +1,47 @@
+import random
+from typing import List
+
+import pytest
+
+from barebells_tracker.models.product import Product
+from barebells_tracker.utils.sorting import TopKUnique, sort_by_per_unit_price, top_k_unique
+
+
+def reference_top_k(products: List[Product], k: int) -> List[Product]:
+    """Stable sort on unit price, keep the first product per (store, unit price), slice."""
+    seen = set()
+    unique = []
+    for p in sort_by_per_unit_price(products):
+        key = (p.store, p.per_unit_price)
+        if key not in seen:
+            seen.add(key)
+            unique.append(p)
+    return unique[:k]
+
+
+def random_products(rng: random.Random, count: int) -> List[Product]:
+    return [
+        Product(f'Bar {i}', rng.choice([20, 25, 30, 240, 300]), f'u{i}', rng.choice(['ica', 'willys', 'apotea']),
+                package_size=12, per_unit_price=rng.choice([None, 18.0, 19.5, 20.0, 21.0, 25.0]))
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_top_k_unique_matches_sort_dedup_slice(seed):
+    rng = random.Random(seed)
+    products = random_products(rng, rng.randint(0, 80))
+    for k in [0, 1, 3, 7, 20]:
+        result = top_k_unique(products, k, lambda p: p.per_unit_price, lambda p: (p.store, p.per_unit_price))
+        assert result == reference_top_k(products, k)
+
+
+def test_top_k_unique_memory_is_bounded_by_k():
+    rng = random.Random(0)
+    selector = TopKUnique(5, lambda p: p.price, lambda p: p.url)
+    for i in range(5000):
+        # Few distinct keys, often seen again with a better price
+        selector.add(Product(f'Bar {i}', rng.uniform(10, 500), f'u{rng.randint(0, 300)}', 'ica'))
+        assert len(selector._ranks) <= 5
+        assert len(selector._heap) <= 10
+    assert len(selector.result()) == 5
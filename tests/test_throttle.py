@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from barebells_tracker.scrapers.throttle import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+def open_breaker(**kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker('example.com', failure_threshold=1, reset_timeout=0, **kwargs)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_probe_outcome_closes_or_reopens():
+    breaker = open_breaker()
+    assert breaker.before_request() is True
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+    breaker = open_breaker()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_released_probe_lets_the_next_request_probe():
+    breaker = open_breaker()
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.release_probe()
+    assert breaker.state == OPEN
+    assert breaker.before_request() is True
+    assert breaker.state == HALF_OPEN
+
+
+def test_lost_probe_expires():
+    breaker = open_breaker(probe_timeout=0.05)
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    time.sleep(0.06)
+    assert breaker.before_request() is True